@@ -0,0 +1,306 @@
+import argparse
+import glob
+import io
+import json
+import os
+import numpy as np
+import pandas as pd
+from logger import LOG_FILE, HEADER
+
+CACHE_DIR = '.analytics_cache'
+CHECKPOINT_FILE = 'checkpoint.json'
+READ_CHUNK_BYTES = 8 * 1024 * 1024
+SESSION_GAP = 600  # seconds; no round lasts longer, so a bigger gap always starts a new session
+MAX_PARTS = 32  # columnar cache parts before they are merged into one
+FINGERPRINT_BYTES = 256
+
+# Sessions aren't recorded in the log, so they're inferred: a row starts a new session
+# when its score isn't the previous score plus this drop's reward, or after a long gap.
+CORRECT_POINTS, INCORRECT_POINTS = 10, -5
+
+class SessionAnalytics:
+    # Incremental analytics over game_log.csv. Each run only parses bytes appended since
+    # the last checkpoint (byte offset + partial aggregates); parsed rows are also kept
+    # as compact NumPy column parts so per-session queries never touch the CSV again.
+    def __init__(self, log_file=LOG_FILE, cache_dir=CACHE_DIR):
+        self.log_file = log_file
+        self.cache_dir = cache_dir
+        self.checkpoint_path = os.path.join(cache_dir, CHECKPOINT_FILE)
+        self.state = self._empty_state()
+        self._load_checkpoint()
+
+    def _empty_state(self):
+        return {
+            'offset': 0,
+            'fingerprint': '',
+            'rows': 0,
+            'parts': 0,
+            'vocab': [],
+            'last_score': None,
+            'last_ts': None,
+            'session': -1,
+            'foods': {},  # name -> [correct, total]
+            'confusion': {},  # "classification|dropped_in" -> count
+            'sessions': {},  # id -> {start, end, final_score, drops, correct}
+        }
+
+    def _load_checkpoint(self):
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, 'r') as f:
+                self.state.update(json.load(f))
+
+    def _save_checkpoint(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = self.checkpoint_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.state, f)
+        os.replace(tmp, self.checkpoint_path)
+
+    def reset(self):
+        for path in glob.glob(os.path.join(self.cache_dir, 'part-*.npz')):
+            os.remove(path)
+        self.state = self._empty_state()
+        self._save_checkpoint()
+
+    def _fingerprint(self, f):
+        f.seek(0)
+        return f.read(FINGERPRINT_BYTES).hex()
+
+    def update(self):
+        # Returns the number of new rows ingested
+        if not os.path.exists(self.log_file):
+            return 0
+        added = 0
+        with open(self.log_file, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            fingerprint = self._fingerprint(f)
+        if not self.state['fingerprint'] and not self.state['rows']:
+            # First run: logs rotated before there was a checkpoint come first, oldest first
+            for path in reversed(self._backups()):
+                added += self._read(path, 0)
+            self.state['offset'] = 0
+        elif size < self.state['offset'] or not self._same_file(fingerprint, self.state['fingerprint']):
+            # Rotated or replaced. The rows written since the checkpoint went out with the
+            # old file, so finish it where it now lives, then any backups rotated after it;
+            # the current file is then new from its first byte
+            backups = self._backups()
+            for i, path in enumerate(backups):
+                with open(path, 'rb') as f:
+                    head = self._fingerprint(f)
+                if self._same_file(head, self.state['fingerprint']):
+                    added += self._read(path, self.state['offset'])
+                    for newer in reversed(backups[:i]):
+                        added += self._read(newer, 0)
+                    break
+            self.state['offset'] = 0
+        added += self._read(self.log_file, self.state['offset'])
+        if added:
+            self._compact_parts()
+        self._save_checkpoint()
+        return added
+
+    def _same_file(self, fingerprint, known):
+        # Fingerprints grow with the file up to FINGERPRINT_BYTES, so compare what both have
+        common = min(len(fingerprint), len(known))
+        return fingerprint[:common] == known[:common]
+
+    def _backups(self):
+        # Rotated logs, most recent first: game_log.csv.1, .2, ...
+        backups = []
+        while os.path.exists(f'{self.log_file}.{len(backups) + 1}'):
+            backups.append(f'{self.log_file}.{len(backups) + 1}')
+        return backups
+
+    def _read(self, path, offset):
+        # Ingests the whole lines of path from offset on and checkpoints the position
+        added = 0
+        with open(path, 'rb') as f:
+            fingerprint = self._fingerprint(f)
+            f.seek(offset)
+            carry = b''
+            while True:
+                block = f.read(READ_CHUNK_BYTES)
+                if not block:
+                    break
+                block = carry + block
+                cut = block.rfind(b'\n') + 1
+                # Only whole lines; a row the logger is still writing waits for the next run
+                complete, carry = block[:cut], block[cut:]
+                if complete:
+                    added += self._ingest(complete, offset == 0)
+                    offset += len(complete)
+        self.state['offset'] = offset
+        self.state['fingerprint'] = fingerprint
+        return added
+
+    def _ingest(self, data, at_start):
+        df = pd.read_csv(io.BytesIO(data), header=None, names=HEADER, dtype=str, keep_default_na=False)
+        if at_start and len(df) and df.iloc[0]['timestamp'] == 'timestamp':
+            df = df.iloc[1:]
+        df = df[df['timestamp'] != 'timestamp']  # headers written after a rotation
+        if df.empty:
+            return 0
+        ts = pd.to_datetime(df['timestamp'], format='ISO8601').to_numpy().astype('datetime64[ms]').astype(np.int64)
+        score = pd.to_numeric(df['score'], errors='coerce').fillna(0).to_numpy().astype(np.int32)
+        classification = df['classification'].to_numpy()
+        dropped_in = df['dropped_in'].to_numpy()
+        correct = classification == dropped_in
+
+        # Vectorized session split, continuing from the previous chunk's last row
+        prev_score = np.empty_like(score)
+        prev_score[1:] = score[:-1]
+        prev_score[0] = self.state['last_score'] if self.state['last_score'] is not None else 0
+        prev_ts = np.empty_like(ts)
+        prev_ts[1:] = ts[:-1]
+        prev_ts[0] = self.state['last_ts'] if self.state['last_ts'] is not None else ts[0]
+        reward = np.where(correct, CORRECT_POINTS, INCORRECT_POINTS)
+        new_session = (score - prev_score != reward) | (ts - prev_ts > SESSION_GAP * 1000)
+        if self.state['last_score'] is None:
+            new_session[0] = True
+        session = (self.state['session'] + np.cumsum(new_session)).astype(np.int32)
+
+        food_codes = self._encode(df['food_item'].to_numpy())
+        self._write_part({
+            'ts': ts,
+            'food': food_codes,
+            'classification': self._encode(classification),
+            'dropped_in': self._encode(dropped_in),
+            'correct': correct,
+            'score': score,
+            'session': session,
+        })
+        self._merge_aggregates(df, ts, score, correct, session)
+        self.state['last_score'] = int(score[-1])
+        self.state['last_ts'] = int(ts[-1])
+        self.state['session'] = int(session[-1])
+        self.state['rows'] += len(df)
+        return len(df)
+
+    def _encode(self, values):
+        vocab = self.state['vocab']
+        index = {v: i for i, v in enumerate(vocab)}
+        uniques, inverse = np.unique(values.astype(str), return_inverse=True)
+        codes = np.empty(len(uniques), dtype=np.int32)
+        for i, v in enumerate(uniques.tolist()):
+            if v not in index:
+                index[v] = len(vocab)
+                vocab.append(v)
+            codes[i] = index[v]
+        return codes[inverse]
+
+    def _merge_aggregates(self, df, ts, score, correct, session):
+        foods = self.state['foods']
+        per_food = pd.DataFrame({'food': df['food_item'].to_numpy(), 'correct': correct}).groupby('food')['correct'].agg(['sum', 'count'])
+        for name, hits, total in per_food.itertuples():
+            entry = foods.setdefault(name, [0, 0])
+            entry[0] += int(hits)
+            entry[1] += int(total)
+        pairs = pd.Series(df['classification'].to_numpy() + '|' + df['dropped_in'].to_numpy()).value_counts()
+        confusion = self.state['confusion']
+        for key, count in pairs.items():
+            confusion[key] = confusion.get(key, 0) + int(count)
+        frame = pd.DataFrame({'session': session, 'ts': ts, 'score': score, 'correct': correct})
+        per_session = frame.groupby('session').agg(start=('ts', 'min'), end=('ts', 'max'),
+                                                   final_score=('score', 'last'), drops=('ts', 'size'),
+                                                   correct=('correct', 'sum'))
+        sessions = self.state['sessions']
+        for sid, row in per_session.iterrows():
+            entry = sessions.get(str(sid))
+            if entry is None:
+                sessions[str(sid)] = {'start': int(row.start), 'end': int(row.end),
+                                      'final_score': int(row.final_score), 'drops': int(row.drops),
+                                      'correct': int(row.correct)}
+            else:
+                entry['end'] = int(row.end)
+                entry['final_score'] = int(row.final_score)
+                entry['drops'] += int(row.drops)
+                entry['correct'] += int(row.correct)
+
+    def _part_paths(self):
+        return sorted(glob.glob(os.path.join(self.cache_dir, 'part-*.npz')))
+
+    def _write_part(self, columns):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.state['parts'] += 1
+        path = os.path.join(self.cache_dir, f"part-{self.state['parts']:06d}.npz")
+        np.savez(path, **columns)
+
+    def _compact_parts(self):
+        paths = self._part_paths()
+        if len(paths) <= MAX_PARTS:
+            return
+        merged = self.columns()
+        self.state['parts'] += 1
+        path = os.path.join(self.cache_dir, f"part-{self.state['parts']:06d}.npz")
+        np.savez(path, **merged)
+        for old in paths:
+            os.remove(old)
+
+    def columns(self):
+        # All cached rows as NumPy columns (string columns as codes into self.state['vocab'])
+        parts = [np.load(p) for p in self._part_paths()]
+        names = ['ts', 'food', 'classification', 'dropped_in', 'correct', 'score', 'session']
+        if not parts:
+            return {n: np.empty(0) for n in names}
+        return {n: np.concatenate([p[n] for p in parts]) for n in names}
+
+    # --- Queries ---
+    def food_accuracy(self):
+        rows = [(name, c, t, c / t if t else 0.0) for name, (c, t) in self.state['foods'].items()]
+        return pd.DataFrame(rows, columns=['food_item', 'correct', 'total', 'accuracy']).sort_values('accuracy')
+
+    def confusion(self):
+        rows = [key.split('|', 1) + [count] for key, count in self.state['confusion'].items()]
+        df = pd.DataFrame(rows, columns=['classification', 'dropped_in', 'count'])
+        return df.pivot_table(index='classification', columns='dropped_in', values='count', fill_value=0, aggfunc='sum')
+
+    def leaderboard(self, top=10):
+        rows = [(int(sid), pd.Timestamp(s['start'], unit='ms'), s['final_score'], s['drops'],
+                 s['correct'] / s['drops'] if s['drops'] else 0.0)
+                for sid, s in self.state['sessions'].items()]
+        df = pd.DataFrame(rows, columns=['session', 'started', 'final_score', 'drops', 'accuracy'])
+        return df.sort_values(['final_score', 'accuracy'], ascending=False).head(top)
+
+    def score_curve(self, session):
+        # Seconds since session start and score after each drop
+        cols = self.columns()
+        mask = cols['session'] == session
+        ts = cols['ts'][mask]
+        if not len(ts):
+            return np.empty(0), np.empty(0, dtype=np.int32)
+        return (ts - ts[0]) / 1000.0, cols['score'][mask]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Session analytics over the game log.')
+    parser.add_argument('report', nargs='?', default='all',
+                        choices=['all', 'accuracy', 'confusion', 'leaderboard', 'curve'])
+    parser.add_argument('--log', default=LOG_FILE)
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--rebuild', action='store_true', help='discard the checkpoint and re-read the whole log')
+    parser.add_argument('--session', type=int, help='session id for the curve report')
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    analytics = SessionAnalytics(args.log, args.cache_dir)
+    if args.rebuild:
+        analytics.reset()
+    added = analytics.update()
+    print(f"Ingested {added} new rows ({analytics.state['rows']} total, {len(analytics.state['sessions'])} sessions)")
+    if args.report in ('all', 'accuracy'):
+        print('\nPer-food accuracy')
+        print(analytics.food_accuracy().to_string(index=False))
+    if args.report in ('all', 'confusion'):
+        print('\nClassification vs dropped_in')
+        print(analytics.confusion().to_string())
+    if args.report in ('all', 'leaderboard'):
+        print('\nLeaderboard')
+        print(analytics.leaderboard(args.top).to_string(index=False))
+    if args.report == 'curve':
+        session = args.session if args.session is not None else analytics.state['session']
+        seconds, scores = analytics.score_curve(session)
+        print(f'\nScore curve for session {session}')
+        for t, s in zip(seconds.tolist(), scores.tolist()):
+            print(f'{t:8.1f}s  {s}')
+
+if __name__ == '__main__':
+    main()
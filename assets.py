@@ -0,0 +1,165 @@
+import hashlib
+import os
+import queue
+import pygame
+from threading import Thread, Lock
+
+THUMB_CACHE_DIR = '.thumb_cache'
+LOADING_COLOR = (230, 230, 230)
+MISSING_COLOR = (200, 200, 200)
+
+def _has_display():
+    return pygame.display.get_init() and pygame.display.get_surface() is not None
+
+class AssetManager:
+    # Pre-scaled, display-format icons keyed by (path, mtime, size), so an edited file is
+    # picked up and an unchanged one is never decoded twice. Decoding and scaling happen
+    # on a background thread, backed by an on-disk cache of raw RGBA thumbnails. Until an
+    # icon is ready, get() hands out a placeholder surface that pump() later paints the
+    # real icon into, so lists built from get() never need rebuilding.
+    def __init__(self, size, cache_dir=THUMB_CACHE_DIR):
+        self.size = size
+        self.cache_dir = cache_dir
+        self.surfaces = {}
+        self.keys = {}  # path -> current key, to drop surfaces of files that changed
+        self.pending = set()
+        self.unconverted = set()  # built before a display existed; converted on the next get()
+        self.requests = queue.Queue()
+        self.results = []
+        self.lock = Lock()
+        self.thread = None
+        self.decoded = 0
+        self.disk_hits = 0
+        self.failed = 0
+
+    def key(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return (os.path.abspath(path), None, None)
+        return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+    def get(self, path):
+        key = self.key(path)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            if key in self.unconverted and _has_display():
+                surf = self.surfaces[key] = surf.convert_alpha()
+                self.unconverted.discard(key)
+            return surf
+        old = self.keys.get(key[0])
+        if old is not None:
+            self.surfaces.pop(old, None)
+            self.unconverted.discard(old)
+        self.keys[key[0]] = key
+        if not _has_display():
+            self.unconverted.add(key)
+        if key[1] is None:
+            surf = self.surfaces[key] = self._placeholder(MISSING_COLOR)
+            self.failed += 1
+            return surf
+        surf = self.surfaces[key] = self._placeholder(LOADING_COLOR)
+        self.pending.add(key)
+        self.requests.put(key)
+        self._start()
+        return surf
+
+    def images(self, food_items):
+        return [self.get(item['image']) for item in food_items]
+
+    def pump(self):
+        # Main thread only: convert finished loads and paint them into their placeholders.
+        # Returns how many icons became ready.
+        with self.lock:
+            results, self.results = self.results, []
+        for key, data in results:
+            self.pending.discard(key)
+            surf = self.surfaces.get(key)
+            if surf is None:
+                continue  # the file changed again while this version was loading
+            if data is None:
+                surf.fill(MISSING_COLOR)
+            else:
+                # Clear, then add: copies the icon's pixels and alpha exactly instead of blending
+                surf.fill((0, 0, 0, 0))
+                surf.blit(pygame.image.frombuffer(data, self.size, 'RGBA'), (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
+        return len(results)
+
+    def wait(self):
+        # Blocks until everything requested so far is ready (tools and tests; not the game loop)
+        if self.thread is not None:
+            self.requests.join()
+        return self.pump()
+
+    def stats(self):
+        return {'surfaces': len(self.surfaces), 'pending': len(self.pending), 'decoded': self.decoded,
+                'disk_hits': self.disk_hits, 'failed': self.failed}
+
+    def close(self):
+        if self.thread is not None:
+            self.requests.put(None)
+            self.thread.join(timeout=1.0)
+            self.thread = None
+
+    def _placeholder(self, color):
+        surf = pygame.Surface(self.size, pygame.SRCALPHA)
+        if _has_display():
+            surf = surf.convert_alpha()
+        surf.fill(color)
+        return surf
+
+    def _start(self):
+        if self.thread is None:
+            self.thread = Thread(target=self._loader, name='asset-loader', daemon=True)
+            self.thread.start()
+
+    def _loader(self):
+        while True:
+            key = self.requests.get()
+            try:
+                if key is None:
+                    break
+                data = self._load(key)
+                with self.lock:
+                    self.results.append((key, data))
+            finally:
+                self.requests.task_done()
+
+    def _thumb_path(self, key):
+        path, mtime, size = key
+        digest = hashlib.sha1(f'{path}|{mtime}|{size}|{self.size[0]}x{self.size[1]}'.encode()).hexdigest()
+        return os.path.join(self.cache_dir, digest + '.rgba')
+
+    def _load(self, key):
+        thumb = self._thumb_path(key)
+        expected = self.size[0] * self.size[1] * 4
+        try:
+            with open(thumb, 'rb') as f:
+                data = f.read()
+            if len(data) == expected:
+                self.disk_hits += 1
+                return data
+        except OSError:
+            pass
+        try:
+            img = pygame.image.load(key[0])
+            if img.get_bitsize() not in (24, 32):
+                # smoothscale needs true colour; paletted PNGs are widened without touching the display
+                wide = pygame.Surface(img.get_size(), pygame.SRCALPHA, 32)
+                wide.blit(img, (0, 0))
+                img = wide
+            img = pygame.transform.smoothscale(img, self.size)
+            data = pygame.image.tobytes(img, 'RGBA')
+        except Exception:
+            self.failed += 1
+            return None
+        self.decoded += 1
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = thumb + '.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, thumb)
+        except OSError:
+            pass  # the cache is an optimisation; a read-only directory just means no reuse
+        return data
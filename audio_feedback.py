@@ -1,21 +1,180 @@
-import pyttsx3
+import os
+import tempfile
+import time
+from collections import deque
+from itertools import islice
+from threading import Thread, Condition, Event
+
+CORRECT_PHRASE = "Correct! Good job."
+INCORRECT_PHRASE = "Incorrect. Try again."
+QUEUE_SIZE = 4
+STALE_AFTER = 2.0  # seconds; announcements that waited longer than this are dropped
+MAX_CACHED_PHRASES = 64  # selection clips kept in memory; other names use live TTS
+SYNTH_BATCH = 8  # phrases per synthesis pass, so announcements never wait behind a long one
+
+def selection_phrase(food_name):
+    return f"Selected: {food_name}"
 
 class AudioFeedback:
-    def __init__(self, enabled=True):
+    # A single long-lived speech worker owns the pyttsx3 engine, which is not thread-safe.
+    # The feedback phrases are synthesized at startup and played from memory. A selection
+    # phrase is spoken live the first time it is announced and then synthesized in the
+    # background, up to MAX_CACHED_PHRASES of them. With sound off, in silent mode or
+    # without a TTS backend there is no worker and nothing is spoken or synthesized.
+    def __init__(self, enabled=True, silent=False, phrases=()):
+        # phrases: extra fixed phrases worth having as clips from the start
         self.enabled = enabled
-        self.engine = pyttsx3.init()
-        self.engine.setProperty('rate', 170)
+        self.silent = silent or not enabled or os.environ.get('HAND_SORT_SILENT') == '1'
+        self.pending = deque()
+        self.cond = Condition()
+        self.engine = None
+        self.sounds = {}  # phrase -> pygame.mixer.Sound
+        self.spoken = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.requested = set()  # phrases accepted for synthesis, at most MAX_CACHED_PHRASES
+        self.stopping = False
+        self.mixer_ready = Event()  # set by init_mixer() on the main thread
+        self.thread = None
+        if not self.silent:
+            self.preload(phrases)
+            self.thread = Thread(target=self._worker, name='speech', daemon=True)
+            self.thread.start()
+
+    def init_mixer(self):
+        # Main thread, after pygame.init(): SDL subsystems must not be initialised from two
+        # threads at once, so the worker waits for this before it loads any clip
+        if self.thread is not None:
+            try:
+                import pygame
+                if not pygame.mixer.get_init():
+                    pygame.mixer.init()
+            except Exception:
+                pass  # no audio device for clips; live TTS still works
+        self.mixer_ready.set()
+
+    def _worker(self):
+        try:
+            import pyttsx3
+            self.engine = pyttsx3.init()
+            self.engine.setProperty('rate', 170)
+        except Exception:
+            self.silent = True
+            return
+        while not self.mixer_ready.wait(0.5):
+            if self.stopping:
+                return
+        self._synthesize([CORRECT_PHRASE, INCORRECT_PHRASE])
+        while True:
+            with self.cond:
+                while not self.pending and not self.stopping:
+                    self.cond.wait()
+                if self.stopping:
+                    return
+                # Announcements go before background synthesis
+                entry = next((e for e in self.pending if e[0] == 'say'), self.pending[0])
+                self.pending.remove(entry)
+            kind, payload, queued_at = entry
+            if kind == 'synth':
+                self._synthesize(payload)
+            elif time.monotonic() - queued_at > STALE_AFTER:
+                self.dropped += 1
+            else:
+                self._speak(payload)
+
+    def _synthesize(self, phrases):
+        phrases = [p for p in phrases if p not in self.sounds]
+        if not phrases:
+            return
+        try:
+            import pygame
+            if not pygame.mixer.get_init():
+                return  # no audio device for clips; live TTS still works
+        except Exception:
+            return
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = {}
+            for i, phrase in enumerate(phrases):
+                paths[phrase] = os.path.join(tmp, f'phrase_{i}.wav')
+                self.engine.save_to_file(phrase, paths[phrase])
+            try:
+                self.engine.runAndWait()
+            except Exception:
+                return
+            for phrase, path in paths.items():
+                try:
+                    self.sounds[phrase] = pygame.mixer.Sound(path)
+                except Exception:
+                    pass  # backend wrote a format the mixer can't read; falls back to live TTS
+
+    def _speak(self, text):
+        sound = self.sounds.get(text)
+        try:
+            if sound is not None:
+                sound.play()
+                # Let the clip finish so announcements don't talk over each other
+                time.sleep(sound.get_length())
+            else:
+                self.engine.say(text)
+                self.engine.runAndWait()
+            self.spoken += 1
+        except Exception:
+            pass
+
+    def _enqueue(self, kind, payload):
+        with self.cond:
+            if kind == 'say':
+                # Coalesce: a newer request for the same text replaces the pending one
+                for entry in self.pending:
+                    if entry[0] == 'say' and entry[1] == payload:
+                        self.pending.remove(entry)
+                        self.coalesced += 1
+                        break
+                # Drop the oldest announcements rather than let speech fall behind the game
+                while sum(1 for e in self.pending if e[0] == 'say') >= QUEUE_SIZE:
+                    oldest = next(e for e in self.pending if e[0] == 'say')
+                    self.pending.remove(oldest)
+                    self.dropped += 1
+            self.pending.append((kind, payload, time.monotonic()))
+            self.cond.notify()
+
+    def preload(self, phrases):
+        # Synthesize more fixed phrases (e.g. newly added food names) on the worker, up to
+        # MAX_CACHED_PHRASES in all
+        if self.silent:
+            return
+        with self.cond:
+            room = MAX_CACHED_PHRASES - len(self.requested)
+            phrases = list(islice((p for p in phrases if p not in self.requested), max(0, room)))
+            self.requested.update(phrases)
+        for i in range(0, len(phrases), SYNTH_BATCH):
+            self._enqueue('synth', phrases[i:i + SYNTH_BATCH])
 
     def say(self, text):
-        if self.enabled:
-            self.engine.say(text)
-            self.engine.runAndWait()
+        # Never blocks the caller
+        if self.enabled and not self.silent and self.thread is not None:
+            self._enqueue('say', text)
 
     def announce_selection(self, food_name):
-        self.say(f"Selected: {food_name}")
+        # Live TTS this time; a clip for next time
+        phrase = selection_phrase(food_name)
+        self.say(phrase)
+        self.preload([phrase])
 
     def announce_feedback(self, correct):
         if correct:
-            self.say("Correct! Good job.")
+            self.say(CORRECT_PHRASE)
         else:
-            self.say("Incorrect. Try again.") 
\ No newline at end of file
+            self.say(INCORRECT_PHRASE)
+
+    def stats(self):
+        return {'spoken': self.spoken, 'coalesced': self.coalesced, 'dropped': self.dropped,
+                'cached_phrases': len(self.sounds)}
+
+    def close(self):
+        with self.cond:
+            self.stopping = True
+            self.cond.notify()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
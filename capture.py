@@ -0,0 +1,133 @@
+import time
+from collections import deque
+from threading import Thread, Lock, Event
+from profiler import NULL_PROFILER
+
+RING_SIZE = 3
+READ_RETRIES = 6  # consecutive failed reads before the camera counts as lost
+RETRY_DELAY = 0.05  # seconds before the first retry; doubles on each further failure
+
+class Frame:
+    __slots__ = ('image', 'timestamp', 'index')
+
+    def __init__(self, image, timestamp, index):
+        self.image = image
+        self.timestamp = timestamp  # time.perf_counter() when the frame was grabbed
+        self.index = index
+
+class CameraCapture:
+    # Reads frames on a background thread so the game loop never waits on the camera.
+    # Keeps a small ring of recent frames; readers always get the newest one.
+    def __init__(self, cap, ring_size=RING_SIZE, profiler=None):
+        self.cap = cap
+        self.profiler = profiler or NULL_PROFILER
+        self.ring = deque(maxlen=ring_size)
+        self.lock = Lock()
+        self.new_frame = Event()
+        self.stopped = Event()
+        self.active = Event()  # cleared while paused
+        self.active.set()
+        self.thread = None
+        self.error_message = ''
+        self.frames_captured = 0
+        self.frames_dropped = 0  # captured but replaced before anyone read them
+        self.frames_read = 0
+        self.last_read_index = -1
+
+    def start(self):
+        # Also restarts a reader that gave up, e.g. for the next round after the camera was lost
+        if self.thread is not None and not self.thread.is_alive():
+            self.thread = None
+        if self.thread is None:
+            self.error_message = ''
+            self.stopped.clear()
+            self.thread = Thread(target=self._reader, name='camera-capture', daemon=True)
+            self.thread.start()
+        return self
+
+    def pause(self):
+        # Stops reading (and decoding) frames until resume(); the thread stays up so
+        # resuming doesn't reopen the camera
+        if self.active.is_set():
+            self.active.clear()
+            with self.lock:
+                self.ring.clear()  # don't hand out a stale frame after resuming
+
+    def resume(self):
+        self.active.set()
+
+    @property
+    def paused(self):
+        return not self.active.is_set()
+
+    def _reader(self):
+        failures = 0
+        while not self.stopped.is_set():
+            if not self.active.wait(0.1):
+                continue
+            error = 'Camera frame not available.'
+            try:
+                with self.profiler.stage('camera.read'):
+                    ret, image = self.cap.read()
+            except Exception as e:
+                ret, image = False, None
+                error = f'Camera read error: {e}'
+            if not ret:
+                # A dropped USB frame is routine; only a run of failures means the camera is gone
+                failures += 1
+                if failures < READ_RETRIES:
+                    self.stopped.wait(RETRY_DELAY * 2 ** (failures - 1))
+                    continue
+                self.error_message = error
+                self.stopped.set()
+                self.new_frame.set()
+                break
+            failures = 0
+            with self.lock:
+                frame = Frame(image, time.perf_counter(), self.frames_captured)
+                if self.ring and self.ring[-1].index > self.last_read_index:
+                    self.frames_dropped += 1
+                self.ring.append(frame)
+                self.frames_captured += 1
+            self.new_frame.set()
+
+    @property
+    def failed(self):
+        return self.stopped.is_set() and bool(self.error_message)
+
+    def read(self):
+        # Latest frame wins; returns None until the first frame arrives. Never blocks.
+        with self.lock:
+            if not self.ring:
+                return None
+            frame = self.ring[-1]
+            if frame.index != self.last_read_index:
+                self.frames_read += 1
+                self.last_read_index = frame.index
+            self.new_frame.clear()
+            return frame
+
+    def wait(self, timeout=None):
+        # For callers that do want to block (e.g. startup), not the game loop.
+        self.new_frame.wait(timeout)
+        return self.read()
+
+    def stats(self):
+        with self.lock:
+            return {
+                'captured': self.frames_captured,
+                'read': self.frames_read,
+                'dropped': self.frames_dropped,
+            }
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+
+    def release(self):
+        self.stop()
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
@@ -1,38 +1,225 @@
 import json
 import os
+from bisect import bisect_left, insort
+
+# The catalog is a snapshot (food_items.json) plus an append-only journal of edits since
+# that snapshot (food_items.json.journal, one JSON op per line). An edit appends and
+# fsyncs one line; once the journal is long enough it is folded into a new snapshot that
+# replaces the old one atomically. Journal ops are idempotent (add is an upsert by id), so
+# replaying a journal over a snapshot that already contains it is harmless.
+SNAPSHOT_VERSION = 2
+COMPACT_AFTER = 256  # journal entries before the next edit triggers a compaction
+
+def _name_keys(item):
+    # The name from each word onward, so a prefix search also finds later words
+    # ("cur" finds "Chicken Curry")
+    words = item['name'].lower().split()
+    return [(' '.join(words[i:]), item['id']) for i in range(len(words))]
+
+class RoundView:
+    # One round's working set of items. Shares the catalog's item tuple and only copies it
+    # the first time the round removes something, so starting a round costs nothing.
+    def __init__(self, items):
+        self.items = items
+        self.owned = False
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def remove(self, index):
+        if not self.owned:
+            self.items = list(self.items)
+            self.owned = True
+        del self.items[index]
 
 class FoodManager:
-    def __init__(self, food_items_file='food_items.json'):
+    def __init__(self, food_items_file='food_items.json', compact_after=COMPACT_AFTER):
         self.food_items_file = food_items_file
-        self.food_items = []
+        self.journal_file = food_items_file + '.journal'
+        self.compact_after = compact_after
+        self.items = {}  # id -> item dict; ids only grow, so insertion order is id order
+        self.by_name = {}
+        self.by_type = {}
+        self.next_id = 1
+        self.journal_entries = 0
+        self.cached_items = None
+        self.name_keys = None  # sorted (name suffix, id) pairs for prefix search; built on first search
         self.load()
 
+    # --- Reading ---
+    @property
+    def food_items(self):
+        # Positional, read-only view for the settings list and the ring
+        if self.cached_items is None:
+            self.cached_items = tuple(self.items.values())
+        return self.cached_items
+
+    def round_view(self):
+        return RoundView(self.food_items)
+
+    def get(self, item_id):
+        return self.items.get(item_id)
+
+    def find(self, name):
+        ids = self.by_name.get(name.lower())
+        return self.items[next(iter(ids))] if ids else None
+
+    def of_type(self, type_):
+        return [self.items[i] for i in self.by_type.get(type_, ())]
+
+    def types(self):
+        return list(self.by_type)
+
+    def search(self, prefix):
+        # Items with a word in their name starting with prefix, in catalog order
+        prefix = ' '.join(prefix.lower().split())
+        if not prefix:
+            return self.food_items
+        if self.name_keys is None:
+            self.name_keys = sorted(key for item in self.items.values() for key in _name_keys(item))
+        keys = self.name_keys
+        lo = bisect_left(keys, (prefix,))
+        hi = bisect_left(keys, (prefix + '\uffff',), lo)
+        ids = sorted({item_id for _, item_id in keys[lo:hi]})
+        return tuple(self.items[i] for i in ids)
+
+    # --- Loading ---
     def load(self):
+        self.items = {}
+        self.by_name = {}
+        self.by_type = {}
+        self.next_id = 1
+        self.journal_entries = 0
+        self.cached_items = None
+        self.name_keys = None
+        legacy = False
         if os.path.exists(self.food_items_file):
             with open(self.food_items_file, 'r') as f:
-                self.food_items = json.load(f)
-        else:
-            self.food_items = []
+                data = json.load(f)
+            legacy = isinstance(data, list)
+            if legacy:  # original format: a bare list without ids
+                data = {'items': data}
+            for item in data.get('items', []):
+                item = dict(item)
+                item.setdefault('id', self.next_id)
+                self._put(item)
+            self.next_id = max(self.next_id, data.get('next_id', 1))
+        if os.path.exists(self.journal_file):
+            self._replay()
+        if legacy:
+            # Ids from list position only hold until someone edits the file, so persist
+            # them before any journal line refers to one
+            self.save()
 
-    def save(self):
-        with open(self.food_items_file, 'w') as f:
-            json.dump(self.food_items, f, indent=4)
+    def _replay(self):
+        good = 0
+        with open(self.journal_file, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # torn final write from a crash; everything before it stands
+                try:
+                    op = json.loads(line)
+                except ValueError:
+                    break
+                self._apply(op)
+                good += len(line)
+                self.journal_entries += 1
+        if good != os.path.getsize(self.journal_file):
+            with open(self.journal_file, 'r+b') as f:
+                f.truncate(good)
 
+    # --- Writing ---
     def add_food_item(self, name, image, type_):
-        self.food_items.append({"name": name, "image": image, "type": type_})
-        self.save()
+        item = {'id': self.next_id, 'name': name, 'image': image, 'type': type_}
+        self._commit({'op': 'add', 'item': item})
+        return item['id']
+
+    def update_item(self, item_id, **fields):
+        fields = {k: v for k, v in fields.items() if v}
+        if item_id in self.items and fields:
+            self._commit({'op': 'update', 'id': item_id, 'fields': fields})
+
+    def remove_item(self, item_id):
+        if item_id in self.items:
+            self._commit({'op': 'remove', 'id': item_id})
 
     def update_food_item(self, index, name=None, image=None, type_=None):
         if 0 <= index < len(self.food_items):
-            if name:
-                self.food_items[index]["name"] = name
-            if image:
-                self.food_items[index]["image"] = image
-            if type_:
-                self.food_items[index]["type"] = type_
-            self.save()
+            self.update_item(self.food_items[index]['id'], name=name, image=image, type=type_)
 
     def remove_food_item(self, index):
         if 0 <= index < len(self.food_items):
-            self.food_items.pop(index)
-            self.save() 
\ No newline at end of file
+            self.remove_item(self.food_items[index]['id'])
+
+    def save(self):
+        # Writes a fresh snapshot and empties the journal
+        data = {'version': SNAPSHOT_VERSION, 'next_id': self.next_id, 'items': list(self.items.values())}
+        tmp = self.food_items_file + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.food_items_file)
+        with open(self.journal_file, 'w'):
+            pass
+        self.journal_entries = 0
+
+    def _commit(self, op):
+        # Apply in memory only once the op is durable
+        with open(self.journal_file, 'a') as f:
+            f.write(json.dumps(op) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self._apply(op)
+        self.journal_entries += 1
+        if self.journal_entries >= self.compact_after:
+            self.save()
+
+    def _apply(self, op):
+        kind = op.get('op')
+        if kind == 'add':
+            self._put(dict(op['item']))
+        elif kind == 'update' and op['id'] in self.items:
+            # Items are replaced, never edited in place, so views holding the old one are unaffected
+            self._put(dict(self.items[op['id']], **op['fields']))
+        elif kind == 'remove':
+            self._drop(op['id'])
+
+    def _put(self, item):
+        item_id = item['id']
+        if item_id in self.items:
+            self._unindex(self.items[item_id])
+        self.items[item_id] = item
+        self.by_name.setdefault(item['name'].lower(), {})[item_id] = None
+        self.by_type.setdefault(item['type'], {})[item_id] = None
+        if self.name_keys is not None:
+            for key in _name_keys(item):
+                insort(self.name_keys, key)
+        self.next_id = max(self.next_id, item_id + 1)
+        self.cached_items = None
+
+    def _drop(self, item_id):
+        item = self.items.pop(item_id, None)
+        if item is not None:
+            self._unindex(item)
+            self.cached_items = None
+
+    def _unindex(self, item):
+        for index, key in ((self.by_name, item['name'].lower()), (self.by_type, item['type'])):
+            ids = index.get(key)
+            if ids is not None:
+                ids.pop(item['id'], None)
+                if not ids:
+                    del index[key]
+        if self.name_keys is not None:
+            keys = self.name_keys
+            for key in _name_keys(item):
+                i = bisect_left(keys, key)
+                if i < len(keys) and keys[i] == key:
+                    del keys[i]
@@ -0,0 +1,58 @@
+import cv2
+import numpy as np
+import pygame
+
+class FramePresenter:
+    # Camera-to-screen path built on preallocated buffers:
+    #   BGR camera frame -> RGB (once, also used for inference) -> mirrored -> resized
+    #   straight into the pixel buffer behind a persistent display-sized surface.
+    # Nothing is allocated per frame once the camera resolution is known.
+    def __init__(self, size, interpolation=cv2.INTER_LINEAR):
+        self.size = size
+        self.interpolation = interpolation
+        self.rgb_unflipped = None
+        self.rgb = None  # mirrored RGB at camera resolution
+        width, height = size
+        self.display_rgb = np.empty((height, width, 3), dtype=np.uint8)
+        self.surface = pygame.image.frombuffer(self.display_rgb, size, 'RGB')
+        self.total_allocations = 2
+        self.last_frame_allocations = 0
+        self.last_frame_copies = 0
+        self.frames = 0
+
+    def _ensure_buffers(self, shape):
+        if self.rgb is None or self.rgb.shape != shape:
+            self.rgb_unflipped = np.empty(shape, dtype=np.uint8)
+            self.rgb = np.empty(shape, dtype=np.uint8)
+            self.last_frame_allocations += 2
+
+    def _into(self, out, buf):
+        # OpenCV silently allocates if dst doesn't fit; count it so regressions show up
+        self.last_frame_copies += 1
+        if out.ctypes.data != buf.ctypes.data:
+            self.last_frame_allocations += 1
+            np.copyto(buf, out)
+            self.last_frame_copies += 1
+
+    def prepare(self, bgr):
+        self.last_frame_allocations = 0
+        self.last_frame_copies = 0
+        self._ensure_buffers(bgr.shape)
+        self._into(cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB, dst=self.rgb_unflipped), self.rgb_unflipped)
+        self._into(cv2.flip(self.rgb_unflipped, 1, dst=self.rgb), self.rgb)
+        self._into(cv2.resize(self.rgb, self.size, dst=self.display_rgb, interpolation=self.interpolation),
+                   self.display_rgb)
+        self.total_allocations += self.last_frame_allocations
+        self.frames += 1
+        return self.rgb
+
+    def blit(self, screen, pos=(0, 0)):
+        screen.blit(self.surface, pos)
+
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'allocations': self.last_frame_allocations,
+            'copies': self.last_frame_copies,
+            'total_allocations': self.total_allocations,
+        }
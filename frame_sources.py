@@ -0,0 +1,240 @@
+import os
+import sys
+import time
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+SOURCE_TYPES = ('webcam', 'video', 'images', 'synthetic')
+
+# Frame sources share cv2.VideoCapture's isOpened/read/release interface, so CameraCapture
+# and the game loop run unchanged on any of them. Each also reports the format it actually
+# delivers (describe) and the rate it has been read at (stats).
+
+def _fourcc_name(code):
+    code = int(code)
+    name = ''.join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+    return name if name.isprintable() and name.strip() else ''
+
+class FrameSource:
+    kind = 'source'
+
+    def __init__(self, fps=0):
+        self.frame_interval = 1.0 / fps if fps and fps > 0 else 0
+        self.next_time = None
+        self.frames_read = 0
+        self.first_read = None
+        self.last_read = None
+
+    def isOpened(self):
+        return False
+
+    def _pace(self):
+        if not self.frame_interval:
+            return
+        now = time.perf_counter()
+        if self.next_time is None or self.next_time < now - self.frame_interval:
+            self.next_time = now  # first read, or back from a pause: don't race to catch up
+        if self.next_time > now:
+            time.sleep(self.next_time - now)
+        self.next_time += self.frame_interval
+
+    def _read(self):
+        return False, None
+
+    def read(self):
+        self._pace()
+        ret, frame = self._read()
+        if ret:
+            now = time.perf_counter()
+            if self.first_read is None:
+                self.first_read = now
+            self.last_read = now
+            self.frames_read += 1
+        return ret, frame
+
+    def describe(self):
+        # Effective format: what the source delivers, not what was asked for
+        return {'kind': self.kind}
+
+    def stats(self):
+        span = (self.last_read - self.first_read) if self.frames_read > 1 else 0
+        return {'frames_read': self.frames_read, 'read_fps': (self.frames_read - 1) / span if span else 0.0}
+
+    def release(self):
+        pass
+
+class WebcamSource(FrameSource):
+    # A camera opened with an explicit capture format. On Linux it goes through V4L2
+    # directly. Requesting MJPG lets USB cameras deliver high resolutions at full frame
+    # rate, and a one-frame driver buffer keeps the newest frame from queueing behind old
+    # ones. Zero or empty values leave the driver's default.
+    kind = 'webcam'
+
+    def __init__(self, index=0, width=0, height=0, fps=0, fourcc='', buffer_size=1):
+        super().__init__()
+        self.index = index
+        backend = cv2.CAP_V4L2 if sys.platform.startswith('linux') else cv2.CAP_ANY
+        self.cap = cv2.VideoCapture(index, backend)
+        if not self.cap.isOpened() and backend != cv2.CAP_ANY:
+            self.cap = cv2.VideoCapture(index)
+        if self.cap.isOpened():
+            # V4L2 wants the pixel format before the frame size
+            if fourcc:
+                self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+            if width and height:
+                self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+                self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+            if fps:
+                self.cap.set(cv2.CAP_PROP_FPS, fps)
+            if buffer_size:
+                self.cap.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+
+    def isOpened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def _read(self):
+        return self.cap.read()
+
+    def describe(self):
+        if not self.isOpened():
+            return {'kind': self.kind, 'index': self.index}
+        return {
+            'kind': self.kind,
+            'index': self.index,
+            'backend': self.cap.getBackendName(),
+            'width': int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'fps': self.cap.get(cv2.CAP_PROP_FPS),
+            'fourcc': _fourcc_name(self.cap.get(cv2.CAP_PROP_FOURCC)),
+            'buffer_size': int(self.cap.get(cv2.CAP_PROP_BUFFERSIZE)),
+        }
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+class VideoFileSource(FrameSource):
+    kind = 'video'
+
+    def __init__(self, path, loop=True, realtime=False):
+        self.path = path
+        self.loop = loop
+        self.realtime = realtime  # pace reads at the file's frame rate instead of as fast as possible
+        self.cap = cv2.VideoCapture(path)
+        self.file_fps = self.cap.get(cv2.CAP_PROP_FPS) if self.cap.isOpened() else 0
+        super().__init__(self.file_fps if realtime else 0)
+
+    def isOpened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def _read(self):
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        return ret, frame
+
+    def describe(self):
+        if not self.isOpened():
+            return {'kind': self.kind, 'path': self.path}
+        return {
+            'kind': self.kind,
+            'path': self.path,
+            'width': int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'fps': self.file_fps,
+            'fourcc': _fourcc_name(self.cap.get(cv2.CAP_PROP_FOURCC)),
+            'paced': self.realtime,
+        }
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+class ImageSequenceSource(FrameSource):
+    # Frames are decoded once up front so a replay measures the game, not the disk
+    kind = 'images'
+
+    def __init__(self, directory, loop=True, fps=0):
+        super().__init__(fps)
+        self.directory = directory
+        self.loop = loop
+        self.fps = fps
+        names = sorted(n for n in os.listdir(directory) if n.lower().endswith(IMAGE_EXTENSIONS))
+        self.frames = [f for f in (cv2.imread(os.path.join(directory, n)) for n in names) if f is not None]
+        self.position = 0
+
+    def isOpened(self):
+        return bool(self.frames)
+
+    def _read(self):
+        if self.position >= len(self.frames):
+            if not self.loop or not self.frames:
+                return False, None
+            self.position = 0
+        frame = self.frames[self.position]
+        self.position += 1
+        # Hand out a copy; downstream code is free to treat frames as its own
+        return True, frame.copy()
+
+    def describe(self):
+        h, w = self.frames[0].shape[:2] if self.frames else (0, 0)
+        return {'kind': self.kind, 'path': self.directory, 'width': w, 'height': h, 'fps': self.fps,
+                'frames': len(self.frames)}
+
+    def release(self):
+        self.frames = []
+
+class SyntheticSource(FrameSource):
+    # Generated frames: a bright square circling over a dim gradient. No hardware and no
+    # files, for tests and load runs; the moving square also gives ROI tracking something
+    # to follow if a stand-in model is used.
+    kind = 'synthetic'
+
+    def __init__(self, width=1280, height=720, fps=30, square=120):
+        super().__init__(fps)
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.square = square
+        ramp = np.linspace(30, 90, width, dtype=np.float32).astype(np.uint8)
+        self.background = np.repeat(np.broadcast_to(ramp[None, :, None], (height, width, 1)), 3, axis=2)
+        self.index = 0
+
+    def isOpened(self):
+        return True
+
+    def _read(self):
+        frame = self.background.copy()
+        t = self.index / 30.0
+        cx = int(self.width / 2 + self.width / 3 * np.cos(t))
+        cy = int(self.height / 2 + self.height / 3 * np.sin(t))
+        half = self.square // 2
+        frame[max(0, cy - half):cy + half, max(0, cx - half):cx + half] = 230
+        self.index += 1
+        return True, frame
+
+    def describe(self):
+        return {'kind': self.kind, 'width': self.width, 'height': self.height, 'fps': self.fps}
+
+def open_replay_source(path, loop=True, realtime=False):
+    if os.path.isdir(path):
+        return ImageSequenceSource(path, loop=loop, fps=30 if realtime else 0)
+    return VideoFileSource(path, loop=loop, realtime=realtime)
+
+def open_source(settings):
+    # The game's frame source, as chosen in Settings
+    kind = settings.capture_source
+    if kind == 'webcam':
+        return WebcamSource(settings.camera_index, settings.camera_width, settings.camera_height,
+                            settings.camera_fps, settings.camera_fourcc, settings.camera_buffer_size)
+    if kind == 'video':
+        return VideoFileSource(settings.capture_path, loop=True, realtime=True)
+    if kind == 'images':
+        return ImageSequenceSource(settings.capture_path, loop=True, fps=settings.camera_fps or 30)
+    if kind == 'synthetic':
+        return SyntheticSource(settings.camera_width or 1280, settings.camera_height or 720, settings.camera_fps or 30)
+    raise ValueError(f'Unknown capture_source {kind!r}; expected one of {", ".join(SOURCE_TYPES)}')
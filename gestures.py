@@ -0,0 +1,87 @@
+import numpy as np
+from functools import lru_cache
+
+NUM_LANDMARKS = 21
+LEFT, RIGHT = 0, 1
+HAND_SLOTS = {'Left': LEFT, 'Right': RIGHT}
+WRIST, INDEX_MCP, INDEX_TIP = 0, 5, 8
+FINGER_TIPS = np.array([8, 12, 16, 20])
+FINGER_PIPS = FINGER_TIPS - 2
+
+# Both hands live in one (2, 21, 3) float32 array of normalized (x, y, z), slot 0 = left,
+# slot 1 = right, with a (2,) bool mask saying which slots hold a detected hand.
+def empty_hands():
+    return np.zeros((2, NUM_LANDMARKS, 3), dtype=np.float32), np.zeros(2, dtype=bool)
+
+def landmarks_to_array(multi_hand_landmarks, multi_handedness):
+    hands, present = empty_hands()
+    if multi_hand_landmarks and multi_handedness:
+        for landmarks, hand in zip(multi_hand_landmarks, multi_handedness):
+            slot = HAND_SLOTS.get(hand.classification[0].label)
+            if slot is None:
+                continue
+            hands[slot] = [(lm.x, lm.y, lm.z) for lm in landmarks.landmark]
+            present[slot] = True
+    return hands, present
+
+def to_pixels(hands, width, height):
+    return hands[..., :2] * np.array([width, height], dtype=np.float32)
+
+def palm_open(hands):
+    # Finger tips above their pip joints (y axis), per hand
+    return (hands[..., FINGER_TIPS, 1] < hands[..., FINGER_PIPS, 1]).all(axis=-1)
+
+def grabbing(hands):
+    # Finger tips below their pip joints (y axis), per hand
+    return (hands[..., FINGER_TIPS, 1] > hands[..., FINGER_PIPS, 1]).all(axis=-1)
+
+def wrist_angles(hands):
+    # Angle between wrist and index mcp, per hand
+    d = hands[..., INDEX_MCP, :2] - hands[..., WRIST, :2]
+    return np.arctan2(d[..., 1], d[..., 0])
+
+@lru_cache(maxsize=32)
+def ring_unit_vectors(n):
+    angles = 2 * np.pi * np.arange(n) / n
+    table = np.stack([np.cos(angles), np.sin(angles)], axis=1)
+    table.setflags(write=False)
+    return table
+
+def ring_positions(center, radius, angle_offset, n):
+    c, s = np.cos(angle_offset), np.sin(angle_offset)
+    unit = ring_unit_vectors(n)
+    rotated = unit @ np.array([[c, s], [-s, c]])
+    return (np.asarray(center) + radius * rotated).astype(np.int32)
+
+def closest_ring_item(pos, center, angle_offset, n):
+    # Nearest point on the ring = largest dot product with the pointer direction once
+    # it is rotated into the ring's unrotated frame; one matvec + argmax.
+    if n <= 0:
+        return 0
+    dx, dy = pos[0] - center[0], pos[1] - center[1]
+    c, s = np.cos(angle_offset), np.sin(angle_offset)
+    rel = np.array([c*dx + s*dy, -s*dx + c*dy])
+    return int(np.argmax(ring_unit_vectors(n) @ rel))
+
+@lru_cache(maxsize=32)
+def _window_offsets(k):
+    offsets = np.arange(k) - k // 2
+    offsets.setflags(write=False)
+    return offsets
+
+def ring_window(scroll, n, k):
+    # Virtualized ring: a k-slot window onto n items, centred on the selection.
+    # scroll is the position in items (fractional while turning); the selection is the
+    # nearest whole item, and each slot's angle is relative to the selection's slot.
+    base = int(np.floor(scroll + 0.5))
+    offsets = _window_offsets(k)
+    indices = (base + offsets) % n
+    angles = (offsets - (scroll - base)) * (2 * np.pi / k)
+    return base % n, indices, angles
+
+def ring_points(center, radius, angles):
+    pts = np.stack([np.cos(angles), np.sin(angles)], axis=1)
+    return (np.asarray(center) + radius * pts).astype(np.int32)
+
+def wrap_angle(a):
+    return (a + np.pi) % (2 * np.pi) - np.pi
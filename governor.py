@@ -0,0 +1,67 @@
+import time
+
+# Quality ladder, best first. Each step down trades a little fidelity for frame time.
+QUALITY_LEVELS = [
+    {'inference_scale': 1.0, 'model_complexity': 1, 'inference_every_n': 1, 'particle_limit': None, 'smooth_scaling': True},
+    {'inference_scale': 1.0, 'model_complexity': 1, 'inference_every_n': 1, 'particle_limit': 300, 'smooth_scaling': False},
+    {'inference_scale': 0.75, 'model_complexity': 0, 'inference_every_n': 1, 'particle_limit': 200, 'smooth_scaling': False},
+    {'inference_scale': 0.5, 'model_complexity': 0, 'inference_every_n': 2, 'particle_limit': 100, 'smooth_scaling': False},
+    {'inference_scale': 0.5, 'model_complexity': 0, 'inference_every_n': 3, 'particle_limit': 40, 'smooth_scaling': False},
+]
+SMOOTHING = 0.1  # EMA weight of the newest frame
+OVER_BUDGET = 0.95  # fraction of the budget that counts as "over"
+HEADROOM = 0.6  # below this fraction of the budget there is room to restore quality
+DEGRADE_AFTER = 15  # consecutive over-budget frames before stepping down
+RESTORE_AFTER = 90  # consecutive frames with headroom before stepping back up
+COOLDOWN = 1.0  # seconds after a change before the next one, so effects can settle
+
+class FrameGovernor:
+    # Compares measured frame work time (excluding the tick sleep) against the budget for
+    # the target FPS and moves along QUALITY_LEVELS with hysteresis. apply_level is called
+    # with the new level dict whenever it changes.
+    def __init__(self, target_fps, apply_level, enabled=True, levels=QUALITY_LEVELS):
+        self.budget = 1.0 / target_fps
+        self.apply_level = apply_level
+        self.enabled = enabled
+        self.levels = levels
+        self.level = 0
+        self.ema = None
+        self.over = 0
+        self.under = 0
+        self.last_change = 0.0
+        self.changes = 0
+
+    def reset(self):
+        self.ema = None
+        self.over = self.under = 0
+
+    def frame(self, work_time, now=None):
+        if not self.enabled:
+            return
+        now = time.perf_counter() if now is None else now
+        self.ema = work_time if self.ema is None else self.ema + SMOOTHING * (work_time - self.ema)
+        if self.ema > self.budget * OVER_BUDGET:
+            self.over += 1
+            self.under = 0
+        elif self.ema < self.budget * HEADROOM:
+            self.under += 1
+            self.over = 0
+        else:
+            self.over = self.under = 0
+        if now - self.last_change < COOLDOWN:
+            return
+        if self.over >= DEGRADE_AFTER and self.level < len(self.levels) - 1:
+            self.set_level(self.level + 1, now)
+        elif self.under >= RESTORE_AFTER and self.level > 0:
+            self.set_level(self.level - 1, now)
+
+    def set_level(self, level, now=None):
+        self.level = level
+        self.last_change = time.perf_counter() if now is None else now
+        self.over = self.under = 0
+        self.changes += 1
+        self.apply_level(self.levels[level])
+
+    def stats(self):
+        return {'level': self.level, 'frame_ms': (self.ema or 0.0) * 1000.0,
+                'budget_ms': self.budget * 1000.0, 'changes': self.changes}
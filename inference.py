@@ -0,0 +1,276 @@
+import time
+import cv2
+import numpy as np
+from threading import Thread, Lock, Event
+from profiler import NULL_PROFILER
+from gestures import landmarks_to_array
+
+ROI_PADDING = 0.6  # padding on each side of the hands' bounding box, as a fraction of its size
+ROI_MIN_SIDE = 0.3  # smallest crop side, as a fraction of the frame's shorter side
+ROI_MARGIN = 0.1  # hands this close to the crop's edge (fraction of its size) move the crop
+MAX_CONSECUTIVE_ERRORS = 5  # failed inferences in a row before the worker reports an error
+
+class HandResult:
+    __slots__ = ('multi_hand_landmarks', 'multi_handedness', 'hands', 'present', 'timestamp', 'frame_index',
+                 'latency', 'roi')
+
+    def __init__(self, multi_hand_landmarks, multi_handedness, timestamp, frame_index, latency, roi=None):
+        # multi_hand_landmarks is the raw model output, so relative to the crop when roi is set;
+        # hands is always in full-frame normalized coordinates.
+        self.multi_hand_landmarks = multi_hand_landmarks
+        self.multi_handedness = multi_handedness
+        # (2, 21, 3) landmark array + presence mask, built here so the game thread doesn't have to
+        self.hands, self.present = landmarks_to_array(multi_hand_landmarks, multi_handedness)
+        if roi is not None:
+            roi_to_frame(self.hands, roi)
+        self.timestamp = timestamp  # capture time of the source frame
+        self.frame_index = frame_index
+        self.latency = latency  # seconds from capture to result
+        self.roi = roi  # (x, y, w, h, frame_w, frame_h) crop in pixels, or None for a full-frame search
+
+def roi_to_frame(hands, roi):
+    # Crop-normalized landmarks -> frame-normalized, in place. z shares x's scale in MediaPipe.
+    x, y, w, h, frame_w, frame_h = roi
+    hands[..., 0] = (hands[..., 0] * w + x) / frame_w
+    hands[..., 1] = (hands[..., 1] * h + y) / frame_h
+    hands[..., 2] *= w / frame_w
+
+def hands_roi(hands, present, frame_w, frame_h, current=None):
+    # Padded pixel box around the detected hands, clipped to the frame. The current crop is
+    # kept while the hands stay well inside it: MediaPipe tracks hands between frames in
+    # input coordinates, and a crop that moves every frame would throw that off.
+    pts = hands[present, :, :2].reshape(-1, 2) * (frame_w, frame_h)
+    x0, y0 = pts.min(axis=0)
+    x1, y1 = pts.max(axis=0)
+    if current is not None:
+        cx, cy, cw, ch = current[:4]
+        mx, my = cw * ROI_MARGIN, ch * ROI_MARGIN
+        if cx + mx <= x0 and cy + my <= y0 and x1 <= cx + cw - mx and y1 <= cy + ch - my:
+            return current
+    min_side = ROI_MIN_SIDE * min(frame_w, frame_h)
+    bw = max(x1 - x0, 1.0)
+    bh = max(y1 - y0, 1.0)
+    w = max(bw * (1 + 2 * ROI_PADDING), min_side)
+    h = max(bh * (1 + 2 * ROI_PADDING), min_side)
+    mid_x, mid_y = (x0 + x1) / 2, (y0 + y1) / 2
+    left = int(max(0, mid_x - w / 2))
+    top = int(max(0, mid_y - h / 2))
+    right = int(min(frame_w, mid_x + w / 2))
+    bottom = int(min(frame_h, mid_y + h / 2))
+    if right - left < 2 or bottom - top < 2:
+        return None
+    return (left, top, right - left, bottom - top, frame_w, frame_h)
+
+def _resize_into(src, size, dst):
+    # Reuses dst when it already has the right shape
+    if dst is None or dst.shape[:2] != (size[1], size[0]):
+        dst = np.empty((size[1], size[0], src.shape[2]), dtype=src.dtype)
+    cv2.resize(src, size, dst=dst, interpolation=cv2.INTER_AREA)
+    return dst
+
+class HandInferenceWorker:
+    # Runs MediaPipe hand inference on its own thread. The game submits frames without
+    # waiting; only the newest pending frame is processed and older ones are skipped.
+    def __init__(self, hands, every_n_frames=1, target_hz=0, profiler=None, hands_factory=None,
+                 roi_tracking=False, roi_size=256, full_search_every=15):
+        self.hands = hands
+        self.hands_factory = hands_factory  # model_complexity -> Hands, for quality changes
+        self.model_complexity = 1
+        self.requested_complexity = None
+        self.scale = 1.0  # inference input size relative to the camera frame
+        self.scaled = None
+        # ROI mode: infer on a crop around the last hands, downsampled so its longer side is at
+        # most roi_size, with a full-frame search when tracking is lost and every full_search_every.
+        self.roi_tracking = roi_tracking
+        self.roi_size = roi_size
+        self.full_search_every = max(1, int(full_search_every))
+        self.roi = None
+        self.roi_input = None
+        # Crops get their own Hands. MediaPipe seeds each frame with the previous frame's hand
+        # rect in normalized input coordinates, which means something else in a crop than in
+        # the full frame, so one tracker alternating between the two starts from the wrong place.
+        self.roi_hands = hands_factory(self.model_complexity) if roi_tracking and hands_factory else None
+        self.since_full_search = 0
+        self.roi_frames = 0
+        self.full_frames = 0
+        self.pixels_inferred = 0
+        self.profiler = profiler or NULL_PROFILER
+        self.every_n_frames = max(1, int(every_n_frames))
+        self.target_hz = target_hz
+        self.lock = Lock()
+        self.has_work = Event()
+        self.stopped = Event()
+        self.thread = None
+        self.pending = None
+        # Two private frame buffers: one may be under inference while the other takes the next frame
+        self.buffers = [None, None]
+        self.busy_slot = None
+        self.result = None
+        self.result_fresh = False
+        self.error_message = ''
+        self.consecutive_errors = 0
+        self.frames_offered = 0
+        self.frames_submitted = 0
+        self.frames_skipped = 0  # submitted but replaced by a newer frame before inference
+        self.frames_inferred = 0
+        self.last_accept_time = 0.0
+
+    def start(self):
+        if self.thread is None:
+            self.stopped.clear()
+            self.thread = Thread(target=self._worker, name='hand-inference', daemon=True)
+            self.thread.start()
+        return self
+
+    def configure(self, scale=None, every_n_frames=None, model_complexity=None):
+        # Quality knobs; safe to call from the game thread while the worker is running
+        if scale is not None:
+            self.scale = min(1.0, max(0.1, scale))
+        if every_n_frames is not None:
+            self.every_n_frames = max(1, int(every_n_frames))
+        if (model_complexity is not None and self.hands_factory is not None
+                and model_complexity != self.model_complexity):
+            self.requested_complexity = model_complexity
+
+    def _prepare_input(self, frame):
+        if self.requested_complexity is not None:
+            # Rebuilt here so the game thread never waits on model loading
+            complexity, self.requested_complexity = self.requested_complexity, None
+            old = [self.hands, self.roi_hands]
+            self.hands = self.hands_factory(complexity)
+            if self.roi_hands is not None:
+                self.roi_hands = self.hands_factory(complexity)
+            self.model_complexity = complexity
+            for model in old:
+                if hasattr(model, 'close'):
+                    model.close()
+        roi = None
+        if self.roi_tracking and self.roi is not None and self.since_full_search < self.full_search_every:
+            roi = self.roi
+        if roi is None:
+            self.since_full_search = 0
+            self.full_frames += 1
+            if self.scale >= 1.0:
+                self.pixels_inferred += frame.shape[0] * frame.shape[1]
+                return frame, None
+            h, w = frame.shape[:2]
+            size = (max(1, int(w * self.scale)), max(1, int(h * self.scale)))
+            self.scaled = _resize_into(frame, size, self.scaled)
+            self.pixels_inferred += size[0] * size[1]
+            # Landmarks are normalized, so a smaller input needs no mapping back
+            return self.scaled, None
+        self.since_full_search += 1
+        self.roi_frames += 1
+        x, y, w, h = roi[:4]
+        crop = frame[y:y + h, x:x + w]
+        factor = min(1.0, self.roi_size / max(w, h)) * self.scale
+        size = (max(1, int(w * factor)), max(1, int(h * factor)))
+        # Resizing also makes the crop contiguous, which MediaPipe needs
+        self.roi_input = _resize_into(crop, size, self.roi_input)
+        self.pixels_inferred += size[0] * size[1]
+        return self.roi_input, roi
+
+    def _track(self, result, frame):
+        if not self.roi_tracking:
+            return
+        if result.present.any():
+            h, w = frame.shape[:2]
+            self.roi = hands_roi(result.hands, result.present, w, h, self.roi)
+        else:
+            self.roi = None  # lost: search the whole frame next time
+
+    def wants_frame(self, timestamp):
+        # Lets the caller skip colour conversion for frames the worker would drop anyway
+        self.frames_offered += 1
+        if (self.frames_offered - 1) % self.every_n_frames:
+            return False
+        if self.target_hz and timestamp - self.last_accept_time < 1.0 / self.target_hz:
+            return False
+        return True
+
+    def submit(self, rgb, timestamp, frame_index):
+        # The caller may reuse rgb straight away; it is copied into a worker-owned buffer
+        with self.lock:
+            slot = 1 if self.busy_slot == 0 else 0
+            buf = self.buffers[slot]
+            if buf is None or buf.shape != rgb.shape:
+                buf = self.buffers[slot] = np.empty_like(rgb)
+            np.copyto(buf, rgb)
+            if self.pending is not None:
+                self.frames_skipped += 1
+            self.pending = (slot, timestamp, frame_index)
+            self.frames_submitted += 1
+            self.last_accept_time = timestamp
+        self.has_work.set()
+
+    def _worker(self):
+        while not self.stopped.is_set():
+            self.has_work.wait(0.1)
+            with self.lock:
+                job = self.pending
+                self.pending = None
+                self.has_work.clear()
+                if job is not None:
+                    self.busy_slot = job[0]
+            if job is None:
+                continue
+            slot, timestamp, frame_index = job
+            try:
+                frame, roi = self._prepare_input(self.buffers[slot])
+                model = self.roi_hands if roi is not None and self.roi_hands is not None else self.hands
+                with self.profiler.stage('hands.process'):
+                    results = model.process(frame)
+                result = HandResult(results.multi_hand_landmarks, results.multi_handedness,
+                                    timestamp, frame_index, time.perf_counter() - timestamp, roi)
+                self._track(result, self.buffers[slot])
+            except Exception as e:
+                # One bad frame just yields no result; only a run of them is an error
+                self.consecutive_errors += 1
+                if self.consecutive_errors >= MAX_CONSECUTIVE_ERRORS:
+                    self.error_message = f'Hand inference error: {e}'
+                continue
+            finally:
+                with self.lock:
+                    self.busy_slot = None
+            self.consecutive_errors = 0
+            with self.lock:
+                self.result = result
+                self.result_fresh = True
+                self.frames_inferred += 1
+
+    def clear_error(self):
+        # A new round starts clean; an error only sticks while inference keeps failing
+        self.consecutive_errors = 0
+        self.error_message = ''
+
+    def poll(self):
+        # Returns a result only once, the first time it is seen
+        with self.lock:
+            if not self.result_fresh:
+                return None
+            self.result_fresh = False
+            return self.result
+
+    def latest(self):
+        # Most recent result, even if already polled (stale reuse)
+        with self.lock:
+            return self.result
+
+    def stats(self):
+        with self.lock:
+            return {
+                'submitted': self.frames_submitted,
+                'skipped': self.frames_skipped,
+                'inferred': self.frames_inferred,
+                'latency': self.result.latency if self.result else None,
+                'roi_frames': self.roi_frames,
+                'full_frames': self.full_frames,
+                'pixels_per_inference': self.pixels_inferred // max(1, self.roi_frames + self.full_frames),
+            }
+
+    def stop(self):
+        self.stopped.set()
+        self.has_work.set()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
@@ -1,25 +1,113 @@
 import csv
 import os
+import time
 from datetime import datetime
+from threading import Thread, Condition
 
 LOG_FILE = 'game_log.csv'
+HEADER = ['timestamp', 'food_item', 'classification', 'dropped_in', 'result', 'score']
+FLUSH_ROWS = 50
+FLUSH_INTERVAL_MS = 1000
+MAX_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 3
 
 class GameLogger:
-    def __init__(self, log_file=LOG_FILE):
+    # With batching on, log() only appends to an in-memory buffer; a background writer
+    # flushes every flush_rows rows or flush_interval_ms, and on flush()/close().
+    # The log is rotated to game_log.csv.1, .2, ... once it reaches max_bytes.
+    def __init__(self, log_file=LOG_FILE, batching=True, flush_rows=FLUSH_ROWS,
+                 flush_interval_ms=FLUSH_INTERVAL_MS, max_bytes=MAX_BYTES, backup_count=BACKUP_COUNT):
         self.log_file = log_file
+        self.batching = batching
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.buffer = []
+        self.cond = Condition()
+        self.flush_requested = False
+        self.writing = False
+        self.closed = False
+        self.error_message = ''
+        self.rows_written = 0
+        self.thread = None
         if not os.path.exists(self.log_file):
-            with open(self.log_file, 'w', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(['timestamp', 'food_item', 'classification', 'dropped_in', 'result', 'score'])
+            self._write_header()
+        if self.batching:
+            self.thread = Thread(target=self._writer, name='game-logger', daemon=True)
+            self.thread.start()
+
+    def _write_header(self):
+        with open(self.log_file, 'w', newline='') as f:
+            csv.writer(f).writerow(HEADER)
 
     def log(self, food_item, classification, dropped_in, result, score):
+        row = [datetime.now().isoformat(), food_item, classification, dropped_in, result, score]
+        if not self.batching:
+            self._write_rows([row])
+            return
+        with self.cond:
+            self.buffer.append(row)
+            if len(self.buffer) >= self.flush_rows:
+                self.cond.notify()
+
+    def _writer(self):
+        while True:
+            with self.cond:
+                deadline = time.monotonic() + self.flush_interval
+                while (not self.closed and not self.flush_requested
+                       and len(self.buffer) < self.flush_rows):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.cond.wait(remaining)
+                rows, self.buffer = self.buffer, []
+                self.flush_requested = False
+                self.writing = bool(rows)
+                closing = self.closed
+            if rows:
+                try:
+                    self._write_rows(rows)
+                except Exception as e:
+                    self.error_message = f'Log write error: {e}'
+            with self.cond:
+                self.writing = False
+                self.cond.notify_all()
+            if closing:
+                return
+
+    def _write_rows(self, rows):
+        if self.max_bytes and os.path.exists(self.log_file) and os.path.getsize(self.log_file) >= self.max_bytes:
+            self._rotate()
         with open(self.log_file, 'a', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                datetime.now().isoformat(),
-                food_item,
-                classification,
-                dropped_in,
-                result,
-                score
-            ]) 
\ No newline at end of file
+            csv.writer(f).writerows(rows)
+        self.rows_written += len(rows)
+
+    def _rotate(self):
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f'{self.log_file}.{i}'
+            if os.path.exists(src):
+                os.replace(src, f'{self.log_file}.{i+1}')
+        if self.backup_count > 0:
+            os.replace(self.log_file, f'{self.log_file}.1')
+        else:
+            os.remove(self.log_file)
+        self._write_header()
+
+    def flush(self, wait=True):
+        if self.thread is None:
+            return
+        with self.cond:
+            self.flush_requested = True
+            self.cond.notify_all()
+            while wait and self.thread.is_alive() and (self.buffer or self.writing or self.flush_requested):
+                self.cond.wait(0.5)
+
+    def close(self):
+        if self.thread is None:
+            return
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+        self.thread.join(timeout=5.0)
+        self.thread = None
@@ -1,120 +1,119 @@
-import cv2
-import mediapipe as mp
 import numpy as np
 import pygame
 import sys
 import time
 import json
 import os
+from threading import Thread, Event
 from settings import Settings
 from food_manager import FoodManager
-from logger import GameLogger
+from logger import GameLogger, LOG_FILE
 from audio_feedback import AudioFeedback
-from threading import Thread
-from PIL import Image
+from capture import CameraCapture
+from text_renderer import render_text, text_renderer
+from particles import Confetti, EmojiRain
+from gestures import (LEFT, RIGHT, landmarks_to_array, to_pixels, palm_open, grabbing,
+                      wrist_angles, ring_positions, closest_ring_item, ring_window, ring_points, wrap_angle)
+from motion import LandmarkPredictor, KEYPOINTS, WRIST_POINT, TIP_POINT
+from recording import LandmarkRecorder, new_recording_path
+from profiler import StageProfiler, StartupTimer
+from governor import FrameGovernor
+from assets import AssetManager
+from zones import ZoneLayout, zone_specs
+from sprite_atlas import SpriteAtlas, ATLAS_CAPACITY
 import traceback
-from ui_utils import draw_rounded_rect, draw_gradient, draw_shadow, animate_value
+from ui_utils import (draw_rounded_rect, draw_gradient, draw_shadow, animate_value, invalidate_surface_cache,
+                      DirtyRegionTracker)
 
 # --- Constants ---
 SCREEN_WIDTH, SCREEN_HEIGHT = 1280, 720
 CIRCLE_RADIUS = 150
 FOOD_ICON_SIZE = 80
-DROP_ZONE_SIZE = 180
-FPS = 30
+MENU_DISC_RADIUS = FOOD_ICON_SIZE // 2 + 8
+MENU_RING_RADIUS = FOOD_ICON_SIZE // 2 + 12
+ATLAS_TILE = 2 * MENU_RING_RADIUS + 2  # one menu sprite, selection ring included
+STATIC_STATES = ('menu', 'paused', 'gameover', 'error', 'settings', 'starting')  # redrawn only when something changes
+IDLE_WAIT_MS = 250  # longest an idle static screen sleeps before rechecking its state
+WARMUP_EVENT = pygame.USEREVENT + 1  # posted by the warm-up thread to wake an idle loop
+SETTINGS_LIST_TOP = 325
+SETTINGS_ROW_HEIGHT = 40
+SETTINGS_ROW_WIDTH = 500
+SETTINGS_VISIBLE_ROWS = (SCREEN_HEIGHT - SETTINGS_LIST_TOP - 50) // SETTINGS_ROW_HEIGHT  # the rest is the search line
 
 # --- Helper Functions ---
-def load_food_images(food_items):
-    images = []
-    for item in food_items:
-        try:
-            img = pygame.image.load(item['image'])
-            img = pygame.transform.smoothscale(img, (FOOD_ICON_SIZE, FOOD_ICON_SIZE))
-        except Exception:
-            img = pygame.Surface((FOOD_ICON_SIZE, FOOD_ICON_SIZE))
-            img.fill((200, 200, 200))
-        images.append(img)
-    return images
-
-def draw_circular_menu(screen, center, food_images, food_items, selected_idx, angle_offset):
-    n = len(food_images)
-    for i, (img, item) in enumerate(zip(food_images, food_items)):
-        angle = 2 * np.pi * i / n + angle_offset
-        x = int(center[0] + CIRCLE_RADIUS * np.cos(angle))
-        y = int(center[1] + CIRCLE_RADIUS * np.sin(angle))
-        color = (0, 200, 0) if item['type'] == 'veg' else (200, 0, 0)
-        pygame.draw.circle(screen, color, (x, y), FOOD_ICON_SIZE // 2 + 8, 0)
-        screen.blit(img, (x - FOOD_ICON_SIZE // 2, y - FOOD_ICON_SIZE // 2))
+def menu_blits(atlas, positions, indices, food_images, food_items, selected_idx, zones):
+    # Blit list for the items the ring currently shows: all of them, or a window in large
+    # rounds. Each item is one atlas tile (disc and icon together), plus the selection ring.
+    half = ATLAS_TILE // 2
+    ring = atlas.get(('ring',), compose_selection_ring)
+    source = atlas.surface
+    seq = []
+    for (x, y), i in zip(positions.tolist(), indices.tolist()):
+        img, color = food_images[i], zones.color(food_items[i]['type'])
+        dest = (x - half, y - half)
+        seq.append((source, dest, atlas.get((img, color), compose_menu_disc, img, color)))
         if i == selected_idx:
-            pygame.draw.circle(screen, (255, 255, 0), (x, y), FOOD_ICON_SIZE // 2 + 12, 4)
-
-def draw_drop_zones(screen):
-    # Veg box (top)
-    veg_rect = (40, SCREEN_HEIGHT//2 - DROP_ZONE_SIZE - 20, DROP_ZONE_SIZE, DROP_ZONE_SIZE)
-    nonveg_rect = (40, SCREEN_HEIGHT//2 + 20, DROP_ZONE_SIZE, DROP_ZONE_SIZE)
-    pygame.draw.rect(screen, (0, 200, 0), veg_rect, 0, 20)
-    pygame.draw.rect(screen, (200, 0, 0), nonveg_rect, 0, 20)
-    font = pygame.font.SysFont(None, 48)
-    veg_text = font.render('VEG', True, (255,255,255))
-    nonveg_text = font.render('NON-VEG', True, (255,255,255))
-    screen.blit(veg_text, (veg_rect[0]+20, veg_rect[1]+veg_rect[3]//2-24))
-    screen.blit(nonveg_text, (nonveg_rect[0]+20, nonveg_rect[1]+nonveg_rect[3]//2-24))
-    return veg_rect, nonveg_rect
-
-# --- Confetti and Emoji Rain ---
-import random
-class Confetti:
-    def __init__(self):
-        self.particles = []
-    def spawn(self, x, y, color):
-        for _ in range(30):
-            angle = random.uniform(0, 2*np.pi)
-            speed = random.uniform(4, 8)
-            self.particles.append({
-                'x': x, 'y': y,
-                'vx': speed*np.cos(angle),
-                'vy': speed*np.sin(angle),
-                'color': color,
-                'life': random.randint(20, 40)
-            })
-    def update(self):
-        for p in self.particles:
-            p['x'] += p['vx']
-            p['y'] += p['vy']
-            p['vy'] += 0.3  # gravity
-            p['life'] -= 1
-        self.particles = [p for p in self.particles if p['life'] > 0]
-    def draw(self, screen):
-        for p in self.particles:
-            pygame.draw.circle(screen, p['color'], (int(p['x']), int(p['y'])), 6)
-
-class EmojiRain:
-    def __init__(self, emoji_img):
-        self.drops = []
-        self.emoji_img = emoji_img
-    def spawn(self, happy=False):
-        for _ in range(10):
-            x = random.randint(0, SCREEN_WIDTH-40)
-            self.drops.append({'x': x, 'y': -40, 'vy': random.uniform(4,8), 'happy': happy})
-    def update(self):
-        for d in self.drops:
-            d['y'] += d['vy']
-        self.drops = [d for d in self.drops if d['y'] < SCREEN_HEIGHT+40]
-    def draw(self, screen):
-        for d in self.drops:
-            screen.blit(self.emoji_img, (int(d['x']), int(d['y'])))
+            seq.append((source, dest, ring))
+    return seq
+
+def compose_menu_disc(tile, img, color):
+    c = ATLAS_TILE // 2
+    pygame.draw.circle(tile, color, (c, c), MENU_DISC_RADIUS, 0)
+    tile.blit(img, (c - FOOD_ICON_SIZE // 2, c - FOOD_ICON_SIZE // 2))
+
+def compose_selection_ring(tile):
+    c = ATLAS_TILE // 2
+    pygame.draw.circle(tile, (255, 255, 0), (c, c), MENU_RING_RADIUS, 4)
+
+def settings_row_surface(item, selected):
+    # One settings list row, highlight included. Rendered straight from the font so that
+    # scrolling a large catalog doesn't churn the shared text cache.
+    surf = pygame.Surface((SETTINGS_ROW_WIDTH, SETTINGS_ROW_HEIGHT - 4), pygame.SRCALPHA)
+    if selected:
+        pygame.draw.rect(surf, (80,120,200), surf.get_rect(), border_radius=10)
+    color = (255,255,255) if selected else (30,30,60)
+    label = text_renderer.font('Arial', 28).render(f"{item['name']} ({item['type']})", True, color)
+    surf.blit(label, (10, 5))
+    return surf.convert_alpha() if pygame.display.get_surface() is not None else surf
 
 # --- Main Game Class ---
 class HandSortingGame:
-    def __init__(self):
+    def __init__(self, frame_source=None, headless=False, log_file=LOG_FILE, use_camera=True):
+        # frame_source: anything with the cv2.VideoCapture isOpened/read/release interface,
+        # used instead of the source chosen in settings. headless: SDL dummy video driver and no speech.
+        # use_camera=False skips capture entirely (landmark replay).
+        # cv2, MediaPipe, the camera and the hand model are loaded by warm_up() on a
+        # background thread, so the menu is on screen while they load.
+        self.initialized = False
+        self.running = True
+        self.headless = headless
         try:
+            self.startup = StartupTimer()
+            self.frame_times = []
+            self.frame_fresh = []  # per entry in frame_times: whether that iteration got a new camera frame
+            self.new_camera_frame = False
             self.settings = Settings()
+            self.profiler = StageProfiler(self.settings.profiling, self.settings.profile_trace_file)
+            self.startup.profiler = self.profiler
             self.timer_setting = self.settings.game_duration
             self.food_manager = FoodManager(self.settings.food_items_file)
-            self.logger = GameLogger()
-            self.audio = AudioFeedback(enabled=self.settings.sound_on)
+            self.assets = AssetManager((FOOD_ICON_SIZE, FOOD_ICON_SIZE))
+            self.zones = self.build_zones()
+            # Enough tiles for a full ring plus the selection ring, so one frame never evicts itself
+            self.atlas = SpriteAtlas(ATLAS_TILE, max(ATLAS_CAPACITY, self.settings.menu_window + 1))
+            self.logger = GameLogger(log_file,
+                                     batching=self.settings.log_batching,
+                                     flush_rows=self.settings.log_flush_rows,
+                                     flush_interval_ms=self.settings.log_flush_interval_ms,
+                                     max_bytes=self.settings.log_max_bytes)
+            self.audio = AudioFeedback(enabled=self.settings.sound_on, silent=headless)
+            self.startup.checkpoint('settings & catalog')
             self.score = 0
             self.selected_idx = 0
             self.angle_offset = 0
+            self.menu_scroll = 0.0  # virtualized ring position, in items
+            self.menu_ref_angle = None  # wrist angle at the last update while the menu was open
+            self.menu_pointer = -np.pi / 2  # direction of the selected slot in a virtualized ring
             self.dragging = False
             self.dragged_idx = None
             self.feedback = ''
@@ -122,7 +121,6 @@ class HandSortingGame:
             self.feedback_time = 0
             self.start_time = None
             self.time_left = self.settings.game_duration
-            self.running = True
             self.menu_buttons = [
                 {'label': 'Start', 'action': 'start'},
                 {'label': 'Settings', 'action': 'settings'},
@@ -130,7 +128,12 @@ class HandSortingGame:
             ]
             self.selected_menu = 0
             self.show_settings = False
-            self.selected_food_setting = 0
+            self.selected_food_setting = 0  # position in the (possibly filtered) settings list
+            self.settings_scroll = 0  # first visible row of the settings list
+            self.settings_query = ''
+            self.settings_searching = False
+            self.settings_matches = None  # (catalog tuple, query, matching items)
+            self.settings_rows = {}  # (item id, selected) -> (item, row surface), visible rows only
             self.menu_center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2)
             self.drag_pos = None
             self.last_left_hand = None
@@ -150,83 +153,335 @@ class HandSortingGame:
             except Exception:
                 self.happy_emoji_img = pygame.Surface((40,40))
                 self.happy_emoji_img.fill((255,255,0))
-            self.emoji_rain = EmojiRain(self.sad_emoji_img)
-            self.happy_rain = EmojiRain(self.happy_emoji_img)
+            self.emoji_rain = EmojiRain(self.sad_emoji_img, SCREEN_WIDTH, SCREEN_HEIGHT)
+            self.happy_rain = EmojiRain(self.happy_emoji_img, SCREEN_WIDTH, SCREEN_HEIGHT)
             self.state = 'menu'  # menu, playing, paused, gameover
             self.error_message = ''
             self.hand_present = False
-            self.food_images = load_food_images(self.food_manager.food_items)
-            try:
-                self.cap = cv2.VideoCapture(0)
-                if not self.cap.isOpened():
-                    raise Exception('Camera not available or permission denied.')
-            except Exception as e:
-                self.error_message = str(e)
-                self.cap = None
+            self.round_items = self.food_manager.round_view()
+            self.food_images = self.assets.images(self.round_items)
+            self.startup.checkpoint('effects, icons')
+            self.capture = None
+            self.last_frame_index = -1
+            self.presenter = None
+            self.cap = None
+            self.recorder = None
             self.clock = None
             self.screen = None
-            self.mp_hands = mp.solutions.hands
-            self.hands = self.mp_hands.Hands(max_num_hands=2, min_detection_confidence=0.7, min_tracking_confidence=0.5)
+            self.mp_hands = None
+            self.hands = None
+            self.inference = None
+            self.workers_started = False
+            self.warmup_done = Event()
+            self.warmup_steps = 4 if use_camera else 1
+            self.warmup_progress = (0, 'Loading video pipeline')  # steps done, what is loading now
+            self.governor = FrameGovernor(self.settings.target_fps, self.apply_quality, self.settings.adaptive_quality)
+            self.predictor = LandmarkPredictor(self.settings.prediction_horizon_ms / 1000.0, self.settings.motion_prediction)
+            self.menu_tracking = False
+            self.dirty_tracker = DirtyRegionTracker()
+            self.view_revision = 0  # bumped by input that can change a static screen
+            self.presented_view = None
+            self.first_frame_shown = False
+            self.warmup_thread = Thread(target=self.warm_up, args=(frame_source, use_camera), name='warm-up', daemon=True)
+            self.warmup_thread.start()
+            self.initialized = True
         except Exception as e:
             self.error_message = f'Initialization error: {e}'
             self.state = 'error'
 
-    def run(self):
+    def warm_up(self, frame_source, use_camera):
+        startup = self.startup
         try:
-            pygame.init()
-            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            with startup.phase('import cv2'):
+                from frame_pipeline import FramePresenter
+                from inference import HandInferenceWorker
+                self.presenter = FramePresenter((SCREEN_WIDTH, SCREEN_HEIGHT))
+            if use_camera:
+                self.set_warmup_progress(1, 'Opening camera')
+                with startup.phase('open camera'):
+                    try:
+                        from frame_sources import open_source
+                        cap = frame_source if frame_source is not None else open_source(self.settings)
+                        if not cap.isOpened():
+                            raise Exception('Camera not available or permission denied.')
+                        self.capture = CameraCapture(cap, profiler=self.profiler)
+                        self.cap = cap
+                    except Exception as e:
+                        self.error_message = str(e)
+                self.set_warmup_progress(2, 'Loading hand tracking')
+                with startup.phase('import mediapipe'):
+                    import mediapipe as mp
+                    self.mp_hands = mp.solutions.hands
+                self.set_warmup_progress(3, 'Loading hand model')
+                with startup.phase('load hand model'):
+                    self.hands = self.create_hands()
+                    self.inference = HandInferenceWorker(self.hands, self.settings.inference_every_n, self.settings.inference_hz,
+                                                         profiler=self.profiler, hands_factory=self.create_hands,
+                                                         roi_tracking=self.settings.inference_roi,
+                                                         roi_size=self.settings.inference_roi_size,
+                                                         full_search_every=self.settings.inference_full_search_every)
+            self.set_warmup_progress(self.warmup_steps, 'Ready')
+        except Exception as e:
+            self.error_message = f'Warm-up error: {e}'
+        finally:
+            self.warmup_done.set()
+            self.wake()
+
+    def set_warmup_progress(self, done, label):
+        self.warmup_progress = (done, label)
+        self.wake()
+
+    def wake(self):
+        # Safe from any thread; a no-op until the display (and its event queue) exists
+        try:
+            pygame.event.post(pygame.event.Event(WARMUP_EVENT))
+        except pygame.error:
+            pass
+
+    def wait_until_ready(self, timeout=None):
+        if not self.initialized:
+            return False
+        return self.warmup_done.wait(timeout)
+
+    def finish_warmup(self):
+        # Main thread, once warm_up() is done: start the camera and inference threads
+        self.workers_started = True
+        if self.capture:
+            if self.state in STATIC_STATES:
+                self.capture.pause()  # started by the first round, not on the menu
+            self.capture.start()
+        if self.inference:
+            self.inference.start()
+        if not self.headless:
+            print(self.startup.report())
+            if hasattr(self.cap, 'describe'):
+                print(f'capture format: {self.cap.describe()}')
+
+    def build_zones(self):
+        return ZoneLayout(zone_specs(self.settings.drop_zones, self.food_manager.types()), (SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    def create_hands(self, model_complexity=1):
+        return self.mp_hands.Hands(max_num_hands=2, model_complexity=model_complexity,
+                                   min_detection_confidence=0.7, min_tracking_confidence=0.5)
+
+    def apply_quality(self, level):
+        # Called by the frame governor when it moves to another quality level
+        import cv2
+        if self.inference:
+            self.inference.configure(level['inference_scale'],
+                                     max(self.settings.inference_every_n, level['inference_every_n']),
+                                     level['model_complexity'])
+        for effect in (self.confetti, self.emoji_rain, self.happy_rain):
+            limit = level['particle_limit']
+            effect.system.set_limit(effect.system.capacity if limit is None else limit)
+        if self.presenter:
+            self.presenter.interpolation = cv2.INTER_LINEAR if level['smooth_scaling'] else cv2.INTER_NEAREST
+
+    def run(self, max_frames=None, throttle=True):
+        # max_frames: stop after that many loop iterations, recording each one's duration in
+        # self.frame_times. throttle=False skips clock.tick so the loop runs flat out.
+        if not self.initialized:
+            return self.run_init_error(max_frames)
+        try:
+            if self.headless:
+                os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            with self.startup.phase('open window'):
+                pygame.init()
+                self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.audio.init_mixer()  # speech clips load only once SDL is up on this thread
+            invalidate_surface_cache()  # cached UI surfaces were built for the previous display, if any
+            text_renderer.clear()  # and fonts from a previous pygame.init() are dead
+            self.dirty_tracker.reset()
+            self.atlas.reset_display()
+            self.settings_rows = {}
+            self.presented_view = None
+            # Icons requested before the display existed come back display-converted now
+            self.food_images = self.assets.images(self.round_items)
             pygame.display.set_caption('Hand-Tracking Food Sorting Game')
             self.clock = pygame.time.Clock()
             self.start_time = time.time()
+            frames = 0
+            profiler = self.profiler
+            last_state = None
             while self.running:
+                frame_start = time.perf_counter()
+                self.new_camera_frame = False
                 try:
-                    self.handle_events()
-                    if self.state == 'menu':
-                        self.render_menu()
-                    elif self.state == 'playing':
-                        if self.cap:
-                            ret, frame = self.cap.read()
-                            if not ret:
-                                self.error_message = 'Camera frame not available.'
-                                self.state = 'error'
-                                continue
-                            frame = cv2.flip(frame, 1)
-                            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                            results = self.hands.process(rgb)
-                            hand_landmarks = results.multi_hand_landmarks
-                            handedness = results.multi_handedness
-                            self.hand_present = bool(hand_landmarks)
-                            self.process_hands(hand_landmarks, handedness)
-                            self.update_game()
-                            self.render(frame)
-                            if self.time_left <= 0:
-                                self.state = 'gameover'
+                    events = None
+                    key = self.view_key()
+                    if self.state in STATIC_STATES and key is not None and key == self.presented_view:
+                        # Nothing to redraw: sleep until input arrives instead of spinning
+                        with profiler.stage('idle'):
+                            event = pygame.event.wait(IDLE_WAIT_MS)
+                        events = [] if event.type == pygame.NOEVENT else [event]
+                    work_start = time.perf_counter()  # the governor times work, not idle waits
+                    with profiler.stage('events'):
+                        self.handle_events(events)
+                    if self.assets.pump():
+                        self.atlas.invalidate()  # tiles composited from placeholders
+                    if not self.workers_started and self.warmup_done.is_set():
+                        self.finish_warmup()
+                    if self.state == 'playing' and not self.workers_started:
+                        self.state = 'starting'  # a round was started before warm-up finished
+                    elif self.state == 'starting' and self.workers_started:
+                        self.state = 'playing'
+                        self.start_time = time.time()  # the wait doesn't count against the timer
+                    # The frame that enters play also ran the idle wait, reset_game and so on;
+                    # the governor starts fresh from the next one
+                    entered_play = self.state == 'playing' and last_state != 'playing'
+                    if entered_play:
+                        self.governor.reset()
+                    last_state = self.state
+                    if self.capture:
+                        # No camera reads while a static screen is up; the idle menu stays idle
+                        if self.state in STATIC_STATES:
+                            self.capture.pause()
                         else:
-                            self.state = 'error'
-                    elif self.state == 'paused':
-                        self.render_pause()
-                    elif self.state == 'gameover':
-                        self.render_gameover()
-                    elif self.state == 'error':
-                        self.render_error()
-                    elif self.state == 'settings':
-                        self.render_settings()
-                    pygame.display.flip()
-                    self.clock.tick(FPS)
+                            self.capture.resume()
+                    if self.state in STATIC_STATES:
+                        self.present_static()
+                    else:
+                        self.presented_view = None
+                        self.dirty_tracker.reset()
+                        self.play_frame()
+                        profiler.draw_overlay(self.screen)
+                        with profiler.stage('flip'):
+                            pygame.display.flip()
+                        if not entered_play:
+                            self.governor.frame(time.perf_counter() - work_start)
+                    # Static screens only redraw every loop while the live overlay is up
+                    if throttle and (self.state == 'playing' or self.presented_view is None):
+                        with profiler.stage('tick'):
+                            self.clock.tick(self.settings.target_fps)
+                    profiler.frame_done()
                 except Exception as e:
                     self.error_message = f'Unexpected error: {e}\n' + traceback.format_exc()
                     self.state = 'error'
-            if self.cap:
+                if max_frames is not None:
+                    self.frame_times.append(time.perf_counter() - frame_start)
+                    self.frame_fresh.append(self.new_camera_frame)
+                    frames += 1
+                    if frames >= max_frames:
+                        self.running = False
+            if self.inference:
+                self.inference.stop()
+            self.audio.close()
+            self.logger.close()
+            self.assets.close()
+            if self.recorder:
+                self.recorder.close()
+            if self.capture:
+                self.capture.release()
+            elif self.cap:
                 self.cap.release()
+            if profiler.enabled:
+                print(f'Profile trace written to {profiler.export_trace()}')
+            text_renderer.clear()  # Font objects must not outlive the font module
             pygame.quit()
         except Exception as e:
             print(f'Critical error: {e}')
 
-    def handle_events(self):
+    def run_init_error(self, max_frames=None):
+        # __init__ failed part-way, so only the error screen can work; it stays up until dismissed
         try:
-            for event in pygame.event.get():
+            if self.headless:
+                os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            pygame.init()
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            text_renderer.clear()
+            pygame.display.set_caption('Hand-Tracking Food Sorting Game')
+            frames = 0
+            while self.running:
+                self.render_error()
+                pygame.display.flip()
+                event = pygame.event.wait(IDLE_WAIT_MS)
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key in (pygame.K_RETURN, pygame.K_ESCAPE)):
+                    self.running = False
+                frames += 1
+                if max_frames is not None and frames >= max_frames:
+                    self.running = False
+            text_renderer.clear()  # Font objects must not outlive the font module
+            pygame.quit()
+        except Exception as e:
+            print(f'Critical error: {e}')
+
+    def view_key(self):
+        # Everything a static screen is drawn from. Input goes through view_revision; the
+        # rest covers changes made outside handle_events (errors, state switches).
+        if self.profiler.enabled and self.profiler.show_overlay:
+            return None  # the overlay's numbers change every frame
+        return (self.state, self.view_revision, self.error_message, self.warmup_progress)
+
+    def present_static(self):
+        key = self.view_key()
+        if key is not None and key == self.presented_view:
+            return
+        with self.profiler.stage('render'):
+            {'menu': self.render_menu, 'paused': self.render_pause, 'gameover': self.render_gameover,
+             'error': self.render_error, 'settings': self.render_settings,
+             'starting': self.render_starting}[self.state]()
+            self.profiler.draw_overlay(self.screen)
+        with self.profiler.stage('flip'):
+            rects = self.dirty_tracker.diff(self.screen)
+            if rects:
+                pygame.display.update(rects)
+        if not self.first_frame_shown:
+            self.first_frame_shown = True
+            self.startup.mark('first frame')
+        self.presented_view = key
+
+    def play_frame(self):
+        profiler = self.profiler
+        if not self.capture:
+            self.state = 'error'
+            return
+        if self.capture.failed or self.inference.error_message:
+            self.error_message = self.capture.error_message or self.inference.error_message
+            self.state = 'error'
+            return
+        with profiler.stage('capture'):
+            captured = self.capture.read()
+            if captured is not None and captured.index != self.last_frame_index:
+                self.last_frame_index = captured.index
+                self.new_camera_frame = True
+                rgb = self.presenter.prepare(captured.image)
+                if self.inference.wants_frame(captured.timestamp):
+                    self.inference.submit(rgb, captured.timestamp, captured.index)
+        if captured is None:
+            # Camera still warming up; keep the loop (and UI) running
+            self.screen.fill((0,0,0))
+            return
+        with profiler.stage('process_hands'):
+            # Landmarks arrive asynchronously; between results the last ones stay in effect
+            result = self.inference.poll()
+            if result is not None:
+                self.hand_present = bool(result.present.any())
+                self.process_hand_array(result.hands, result.present, result.timestamp)
+            else:
+                self.apply_prediction()
+            self.update_game()
+        with profiler.stage('render'):
+            self.render()
+        if self.time_left <= 0:
+            self.end_game()
+
+    def handle_events(self, events=None):
+        try:
+            if events is None:
+                events = pygame.event.get()
+            else:
+                events += pygame.event.get()
+            for event in events:
+                if event.type != pygame.MOUSEMOTION:
+                    self.view_revision += 1
+                if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.VIDEORESIZE):
+                    self.dirty_tracker.reset()  # window contents were lost; present everything
                 if event.type == pygame.QUIT:
                     self.running = False
+                elif event.type == pygame.VIDEORESIZE:
+                    invalidate_surface_cache()
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.profiler.toggle_overlay()
                 elif event.type == pygame.KEYDOWN:
                     if self.state == 'menu':
                         if event.key == pygame.K_UP:
@@ -255,16 +510,19 @@ class HandSortingGame:
                         if event.key == pygame.K_ESCAPE:
                             self.state = 'paused'
                     elif self.state == 'settings':
-                        if event.key == pygame.K_ESCAPE:
-                            self.settings.game_duration = self.timer_setting
-                            self.settings.save()
-                            self.state = 'menu'
-                        elif event.key == pygame.K_UP:
-                            if self.food_manager.food_items:
-                                self.selected_food_setting = (self.selected_food_setting - 1) % len(self.food_manager.food_items)
-                        elif event.key == pygame.K_DOWN:
-                            if self.food_manager.food_items:
-                                self.selected_food_setting = (self.selected_food_setting + 1) % len(self.food_manager.food_items)
+                        if self.settings_searching:
+                            self.handle_search_key(event)
+                        elif self.navigate_settings(event.key):
+                            pass
+                        elif event.key == pygame.K_ESCAPE:
+                            if self.settings_query:
+                                self.set_settings_query('')  # first Esc drops the filter
+                            else:
+                                self.settings.game_duration = self.timer_setting
+                                self.settings.save()
+                                self.state = 'menu'
+                        elif event.unicode == '/':
+                            self.settings_searching = True
                         elif event.key == pygame.K_DELETE or event.key == pygame.K_BACKSPACE:
                             if self.food_manager.food_items:
                                 self.remove_selected_food_item()
@@ -276,6 +534,10 @@ class HandSortingGame:
                             self.set_selected_food_type('veg')
                         elif event.key == pygame.K_n:
                             self.set_selected_food_type('non-veg')
+                        elif event.key == pygame.K_t:
+                            self.cycle_selected_food_type()
+                elif event.type == pygame.MOUSEWHEEL and self.state == 'settings':
+                    self.move_settings_selection(-3 * event.y)
                 elif event.type == pygame.DROPFILE and self.state == 'settings':
                     image_path = event.file
                     self.add_food_item_via_settings(image_path)
@@ -288,30 +550,117 @@ class HandSortingGame:
             name = os.path.splitext(os.path.basename(image_path))[0]
             type_ = 'veg'  # Default, user can edit later
             self.food_manager.add_food_item(name, image_path, type_)
-            self.food_images = load_food_images(self.food_manager.food_items)
+            self.assets.get(image_path)  # start decoding it before the next round needs it
         except Exception as e:
             self.error_message = f'Error adding food item: {e}'
             self.state = 'error'
 
+    # --- Settings list ---
+    def visible_settings_items(self):
+        # The whole catalog, or the items matching the search; recomputed only when either changes
+        items = self.food_manager.food_items
+        cached = self.settings_matches
+        if cached is None or cached[0] is not items or cached[1] != self.settings_query:
+            cached = self.settings_matches = (items, self.settings_query, self.food_manager.search(self.settings_query))
+        return cached[2]
+
+    def selected_setting_item(self):
+        items = self.visible_settings_items()
+        if 0 <= self.selected_food_setting < len(items):
+            return items[self.selected_food_setting]
+        return None
+
+    def move_settings_selection(self, delta, wrap=False):
+        n = len(self.visible_settings_items())
+        if not n:
+            self.selected_food_setting = 0
+        elif wrap:
+            self.selected_food_setting = (self.selected_food_setting + delta) % n
+        else:
+            self.selected_food_setting = max(0, min(n - 1, self.selected_food_setting + delta))
+
+    def navigate_settings(self, key):
+        # List movement keys, shared by browsing and searching; True if key was one of them
+        if key == pygame.K_UP:
+            self.move_settings_selection(-1, wrap=True)
+        elif key == pygame.K_DOWN:
+            self.move_settings_selection(1, wrap=True)
+        elif key == pygame.K_PAGEUP:
+            self.move_settings_selection(-SETTINGS_VISIBLE_ROWS)
+        elif key == pygame.K_PAGEDOWN:
+            self.move_settings_selection(SETTINGS_VISIBLE_ROWS)
+        elif key == pygame.K_HOME:
+            self.selected_food_setting = 0
+        elif key == pygame.K_END:
+            self.move_settings_selection(len(self.visible_settings_items()))
+        else:
+            return False
+        return True
+
+    def set_settings_query(self, query):
+        self.settings_query = query
+        self.selected_food_setting = 0
+        self.settings_scroll = 0
+
+    def handle_search_key(self, event):
+        # Typing narrows the list as it goes; Enter keeps the filter, Esc drops it
+        if event.key == pygame.K_ESCAPE:
+            self.set_settings_query('')
+            self.settings_searching = False
+        elif event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+            self.settings_searching = False
+        elif event.key == pygame.K_BACKSPACE:
+            self.set_settings_query(self.settings_query[:-1])
+        elif self.navigate_settings(event.key):
+            pass
+        elif event.unicode and event.unicode.isprintable():
+            self.set_settings_query(self.settings_query + event.unicode)
+
+    def set_selected_food_type(self, type_):
+        try:
+            item = self.selected_setting_item()
+            if item is not None:
+                self.food_manager.update_item(item['id'], type=type_)
+        except Exception as e:
+            self.error_message = f'Error updating food item: {e}'
+            self.state = 'error'
+
+    def cycle_selected_food_type(self):
+        # Steps the selected item through every drop zone's type
+        item = self.selected_setting_item()
+        if item is not None:
+            types = self.zones.types()
+            current = item['type']
+            next_type = types[(types.index(current) + 1) % len(types)] if current in types else types[0]
+            self.set_selected_food_type(next_type)
+
     def remove_selected_food_item(self):
         try:
-            idx = self.selected_food_setting
-            if idx is not None and 0 <= idx < len(self.food_manager.food_items):
-                self.food_manager.remove_food_item(idx)
-                del self.food_images[idx]
-                if self.selected_food_setting >= len(self.food_manager.food_items):
-                    self.selected_food_setting = max(0, len(self.food_manager.food_items)-1)
+            item = self.selected_setting_item()
+            if item is not None:
+                self.food_manager.remove_item(item['id'])
+                self.move_settings_selection(0)  # keep the selection inside the shorter list
         except Exception as e:
             self.error_message = f'Error removing food item: {e}'
             self.state = 'error'
 
     def reset_game(self):
         try:
-            self.food_manager.load()  # Reload food items from file
-            self.food_images = load_food_images(self.food_manager.food_items)
+            # The round works on its own view; drops never touch the catalog
+            self.round_items = self.food_manager.round_view()
+            self.food_images = self.assets.images(self.round_items)
+            self.zones = self.build_zones()  # the catalog may have gained types since the last round
+            self.atlas.invalidate()
+            if self.workers_started and self.capture and self.capture.failed:
+                self.capture.start()  # a camera lost last round gets another chance
+            if self.inference:
+                self.inference.clear_error()
             self.score = 0
             self.selected_idx = 0
             self.angle_offset = 0
+            self.menu_scroll = 0.0  # virtualized ring position, in items
+            self.menu_ref_angle = None  # wrist angle at the last update while the menu was open
+            self.menu_pointer = -np.pi / 2  # direction of the selected slot in a virtualized ring
             self.dragging = False
             self.dragged_idx = None
             self.feedback = ''
@@ -323,105 +672,141 @@ class HandSortingGame:
             self.drag_pos = None
             self.last_left_hand = None
             self.last_right_hand = None
+            self.menu_tracking = False
+            self.predictor.reset()
             self.selected_food_setting = 0
+            if self.settings.record_landmarks:
+                # One recording per round, replayable with recording.py
+                if self.recorder:
+                    self.recorder.close()
+                self.recorder = LandmarkRecorder(new_recording_path(self.settings.record_landmarks),
+                                                 self.predictor.enabled, self.predictor.horizon)
         except Exception as e:
             self.error_message = f'Error resetting game: {e}'
             self.state = 'error'
 
-    def process_hands(self, hand_landmarks, handedness):
+    def process_hands(self, hand_landmarks, handedness, timestamp=None):
+        hands, present = landmarks_to_array(hand_landmarks, handedness)
+        self.process_hand_array(hands, present, timestamp)
+
+    def process_hand_array(self, hands, present, timestamp=None, now=None):
+        # now: the moment positions are predicted for; the recording's clock on replay
         try:
+            now = time.perf_counter() if now is None else now
+            if self.recorder and timestamp is not None:
+                self.recorder.record(hands, present, timestamp, now)
             self.dragging = False
-            if hand_landmarks and handedness:
-                right_hand = None
-                left_hand = None
-                for i, (landmarks, hand) in enumerate(zip(hand_landmarks, handedness)):
-                    label = hand.classification[0].label  # 'Left' or 'Right'
-                    lm = [(lm.x, lm.y) for lm in landmarks.landmark]
-                    lm_px = [(int(x * SCREEN_WIDTH), int(y * SCREEN_HEIGHT)) for x, y in lm]
-                    if label == 'Right':
-                        right_hand = (lm, lm_px)
-                    elif label == 'Left':
-                        left_hand = (lm, lm_px)
+            self.menu_tracking = False
+            lm_px = to_pixels(hands, SCREEN_WIDTH, SCREEN_HEIGHT)
+            if timestamp is not None:
+                # Positions come from the motion model, extrapolated to now; gestures use what was seen
+                self.predictor.observe(lm_px, present, timestamp)
+                keypoints = self.predictor.predict(now).astype(np.int32)
+            else:
+                keypoints = lm_px[:, KEYPOINTS].astype(np.int32)
+            if present.any():
+                open_palm = palm_open(hands)
+                grab = grabbing(hands)
                 # Right hand: open palm shows menu, wrist rotation controls circle (invert for opposite motion)
-                if right_hand:
-                    lm, lm_px = right_hand
-                    if self.is_palm_open(lm):
-                        cx, cy = lm_px[0]
-                        wrist_angle = -self.get_wrist_angle(lm)  # invert for opposite motion
-                        self.angle_offset = wrist_angle
-                        self.menu_center = (cx, cy)
-                        idx_tip = lm_px[8]
-                        self.selected_idx = self.get_closest_menu_item(idx_tip, cx, cy)
-                        self.last_right_hand = (lm, lm_px)
+                if present[RIGHT] and open_palm[RIGHT]:
+                    cx, cy = keypoints[RIGHT, WRIST_POINT].tolist()
+                    angle = float(wrist_angles(hands[RIGHT]))
+                    self.angle_offset = -angle  # invert for opposite motion
+                    self.menu_center = (cx, cy)
+                    if self.menu_virtual():
+                        self.scroll_menu(angle)
+                    self.selected_idx = self.get_closest_menu_item(keypoints[RIGHT, TIP_POINT], cx, cy)
+                    self.last_right_hand = hands[RIGHT].copy()
+                    self.menu_tracking = True
+                else:
+                    self.menu_ref_angle = None  # reopening the palm picks up from the current scroll
                 # Left hand: grab and drag
-                if left_hand:
-                    lm, lm_px = left_hand
-                    if self.is_grabbing(lm):
+                if present[LEFT]:
+                    if grab[LEFT]:
                         self.dragging = True
                         self.dragged_idx = self.selected_idx
-                        self.drag_pos = lm_px[8]
-                        self.last_left_hand = (lm, lm_px)
+                        self.drag_pos = tuple(keypoints[LEFT, TIP_POINT].tolist())
+                        self.last_left_hand = hands[LEFT].copy()
                     elif self.dragged_idx is not None:
                         drop_zone = self.get_drop_zone(self.drag_pos)
                         if drop_zone:
                             self.handle_drop(drop_zone)
                         self.dragged_idx = None
+            else:
+                self.menu_ref_angle = None
         except Exception as e:
             self.error_message = f'Hand processing error: {e}'
             self.state = 'error'
 
+    def apply_prediction(self, now=None):
+        # Between inference results, move the menu and dragged icon along the predicted path
+        if not self.predictor.enabled:
+            return
+        now = time.perf_counter() if now is None else now
+        if self.recorder:
+            self.recorder.tick(now)
+        keypoints = self.predictor.predict(now).astype(np.int32)
+        if self.menu_tracking and self.predictor.tracking(RIGHT):
+            cx, cy = keypoints[RIGHT, WRIST_POINT].tolist()
+            self.menu_center = (cx, cy)
+            self.selected_idx = self.get_closest_menu_item(keypoints[RIGHT, TIP_POINT], cx, cy)
+        if self.dragging and self.predictor.tracking(LEFT):
+            self.drag_pos = tuple(keypoints[LEFT, TIP_POINT].tolist())
+
     def is_palm_open(self, lm):
-        # Simple: if all finger tips are above their pip joints (y axis)
-        return all(lm[tip][1] < lm[tip-2][1] for tip in [8, 12, 16, 20])
+        return bool(palm_open(np.asarray(lm)))
 
     def is_grabbing(self, lm):
-        # Simple: if all finger tips are below their pip joints (y axis)
-        return all(lm[tip][1] > lm[tip-2][1] for tip in [8, 12, 16, 20])
+        return bool(grabbing(np.asarray(lm)))
 
     def get_wrist_angle(self, lm):
-        # Angle between wrist and index mcp
-        x0, y0 = lm[0]
-        x1, y1 = lm[5]
-        return np.arctan2(y1-y0, x1-x0)
+        return float(wrist_angles(np.asarray(lm)))
+
+    def menu_virtual(self):
+        return len(self.round_items) > self.settings.menu_window
+
+    def scroll_menu(self, angle):
+        # Wrist rotation scrolls the window like a jog dial: one slot's worth of turning moves
+        # one item. Closing and reopening the palm lets the user turn further than a wrist can.
+        if self.menu_ref_angle is not None:
+            step = 2 * np.pi / self.settings.menu_window
+            self.menu_scroll += float(wrap_angle(angle - self.menu_ref_angle)) / step
+        self.menu_ref_angle = angle
 
     def get_closest_menu_item(self, pos, cx, cy):
-        n = len(self.food_manager.food_items)
-        min_dist = float('inf')
-        min_idx = 0
-        for i in range(n):
-            angle = 2 * np.pi * i / n + self.angle_offset
-            x = int(cx + CIRCLE_RADIUS * np.cos(angle))
-            y = int(cy + CIRCLE_RADIUS * np.sin(angle))
-            dist = (pos[0]-x)**2 + (pos[1]-y)**2
-            if dist < min_dist:
-                min_dist = dist
-                min_idx = i
-        return min_idx
+        n = len(self.round_items)
+        if self.menu_virtual():
+            # The selected slot sits under the finger; which item is there depends only on the scroll
+            self.menu_pointer = float(np.arctan2(pos[1] - cy, pos[0] - cx))
+            return int(np.floor(self.menu_scroll + 0.5)) % n
+        return closest_ring_item(pos, (cx, cy), self.angle_offset, n)
+
+    def menu_layout(self):
+        # Item indices on the ring and their screen positions
+        n = len(self.round_items)
+        if not n:
+            return np.zeros((0, 2), np.int32), np.zeros(0, np.int64)
+        if self.menu_virtual():
+            _, indices, angles = ring_window(self.menu_scroll, n, self.settings.menu_window)
+            return ring_points(self.menu_center, CIRCLE_RADIUS, angles + self.menu_pointer), indices
+        return ring_positions(self.menu_center, CIRCLE_RADIUS, self.angle_offset, n), np.arange(n)
 
     def get_drop_zone(self, pos):
-        x, y = pos
-        veg_rect, nonveg_rect = (40, SCREEN_HEIGHT//2 - DROP_ZONE_SIZE - 20, DROP_ZONE_SIZE, DROP_ZONE_SIZE), (40, SCREEN_HEIGHT//2 + 20, DROP_ZONE_SIZE, DROP_ZONE_SIZE)
-        if veg_rect[0] < x < veg_rect[0]+veg_rect[2] and veg_rect[1] < y < veg_rect[1]+veg_rect[3]:
-            return 'veg'
-        if nonveg_rect[0] < x < nonveg_rect[0]+nonveg_rect[2] and nonveg_rect[1] < y < nonveg_rect[1]+nonveg_rect[3]:
-            return 'non-veg'
-        return None
+        zone = self.zones.hit(pos)
+        return zone.type if zone else None
 
     def handle_drop(self, drop_zone):
         try:
-            if self.dragged_idx is not None and 0 <= self.dragged_idx < len(self.food_manager.food_items):
-                item = self.food_manager.food_items[self.dragged_idx]
+            if self.dragged_idx is not None and 0 <= self.dragged_idx < len(self.round_items):
+                item = self.round_items[self.dragged_idx]
                 correct = (item['type'] == drop_zone)
                 if correct:
                     self.score += 10
                     self.feedback = 'Correct!'
                     self.feedback_color = (0, 200, 0)
                     # Confetti at drop zone
-                    if drop_zone == 'veg':
-                        x, y = 40+DROP_ZONE_SIZE//2, SCREEN_HEIGHT//2 - DROP_ZONE_SIZE//2
-                    else:
-                        x, y = 40+DROP_ZONE_SIZE//2, SCREEN_HEIGHT//2 + DROP_ZONE_SIZE + 20
-                    self.confetti.spawn(x, y, (0,200,0) if drop_zone=='veg' else (200,0,0))
+                    zone = self.zones.zone(drop_zone)
+                    self.confetti.spawn(*zone.rect.center, zone.color)
                     self.happy_rain.spawn(happy=True)
                 else:
                     self.score -= 5
@@ -430,119 +815,166 @@ class HandSortingGame:
                     self.emoji_rain.spawn()
                 self.feedback_time = time.time()
                 self.logger.log(item['name'], item['type'], drop_zone, self.feedback, self.score)
-                Thread(target=self.audio.announce_feedback, args=(correct,)).start()
+                self.audio.announce_feedback(correct)
                 # Remove the item from the menu after drop
-                del self.food_manager.food_items[self.dragged_idx]
+                self.round_items.remove(self.dragged_idx)
                 del self.food_images[self.dragged_idx]
                 self.dragged_idx = None
                 # If no items left, end game
-                if not self.food_manager.food_items:
-                    self.state = 'gameover'
+                if not self.round_items:
+                    self.end_game()
         except Exception as e:
             self.error_message = f'Error handling drop: {e}'
             self.state = 'error'
 
-    def update_game(self):
-        self.time_left = self.settings.game_duration - (time.time() - self.start_time)
+    def end_game(self):
+        self.state = 'gameover'
+        self.logger.flush(wait=False)  # get the round onto disk without holding up the frame
+
+    def update_game(self, now=None):
+        now = time.time() if now is None else now
+        self.time_left = self.settings.game_duration - (now - self.start_time)
         # Hide feedback after 1.5s
-        if self.feedback and time.time() - self.feedback_time > 1.5:
+        if self.feedback and now - self.feedback_time > 1.5:
             self.feedback = ''
 
     def render_menu(self):
         self.screen.fill((245, 245, 255))
         draw_gradient(self.screen, (0,0,SCREEN_WIDTH,SCREEN_HEIGHT), (100,180,255), (255,255,255))
-        font = pygame.font.SysFont('Arial', 80, bold=True)
-        title = font.render('Food Sorting Game', True, (30,30,60))
+        title = render_text('Food Sorting Game', 80, (30,30,60), bold=True)
         self.screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 120))
         for i, btn in enumerate(self.menu_buttons):
             rect = (SCREEN_WIDTH//2-150, 300+i*100, 300, 70)
             color = (80, 120, 200) if i == self.selected_menu else (200, 220, 255)
             draw_shadow(self.screen, rect, (0,0,0,60), (6,6), 30)
             draw_rounded_rect(self.screen, rect, color, 30)
-            font2 = pygame.font.SysFont('Arial', 40, bold=True)
-            label = font2.render(btn['label'], True, (30,30,60))
+            label = render_text(btn['label'], 40, (30,30,60), bold=True)
             self.screen.blit(label, (rect[0]+rect[2]//2-label.get_width()//2, rect[1]+rect[3]//2-label.get_height()//2))
         if self.error_message:
-            font3 = pygame.font.SysFont('Arial', 28)
-            err = font3.render(self.error_message, True, (200,0,0))
+            err = render_text(self.error_message, 28, (200,0,0))
             self.screen.blit(err, (SCREEN_WIDTH//2-err.get_width()//2, SCREEN_HEIGHT-100))
+        elif not self.warmup_done.is_set():
+            self.draw_warmup_progress(SCREEN_HEIGHT-110)
+
+    def draw_warmup_progress(self, y):
+        done, label = self.warmup_progress
+        rect = (SCREEN_WIDTH//2-200, y, 400, 16)
+        draw_rounded_rect(self.screen, rect, (200, 210, 230), 8)
+        if done:
+            draw_rounded_rect(self.screen, (rect[0], y, rect[2] * done // self.warmup_steps, 16), (80, 120, 200), 8)
+        text = render_text(f'{label}...', 24, (80,80,120))
+        self.screen.blit(text, (SCREEN_WIDTH//2-text.get_width()//2, y+24))
+
+    def render_starting(self):
+        self.screen.fill((245, 245, 255))
+        draw_gradient(self.screen, (0,0,SCREEN_WIDTH,SCREEN_HEIGHT), (100,180,255), (255,255,255))
+        text = render_text('Getting ready', 60, (30,30,60), bold=True)
+        self.screen.blit(text, (SCREEN_WIDTH//2-text.get_width()//2, 220))
+        self.draw_warmup_progress(340)
 
     def render_pause(self):
         self.screen.fill((230,230,240))
-        font = pygame.font.SysFont('Arial', 60, bold=True)
-        text = font.render('Paused', True, (30,30,60))
+        text = render_text('Paused', 60, (30,30,60), bold=True)
         self.screen.blit(text, (SCREEN_WIDTH//2-text.get_width()//2, 200))
-        font2 = pygame.font.SysFont('Arial', 36)
-        msg = font2.render('Press Enter to resume', True, (80,80,120))
+        msg = render_text('Press Enter to resume', 36, (80,80,120))
         self.screen.blit(msg, (SCREEN_WIDTH//2-msg.get_width()//2, 350))
 
     def render_gameover(self):
         self.screen.fill((255,255,255))
-        font = pygame.font.SysFont('Arial', 70, bold=True)
-        text = font.render('Game Over', True, (200,50,50))
+        text = render_text('Game Over', 70, (200,50,50), bold=True)
         self.screen.blit(text, (SCREEN_WIDTH//2-text.get_width()//2, 120))
-        font2 = pygame.font.SysFont('Arial', 40)
-        score = font2.render(f'Final Score: {self.score}', True, (30,30,60))
+        score = render_text(f'Final Score: {self.score}', 40, (30,30,60))
         self.screen.blit(score, (SCREEN_WIDTH//2-score.get_width()//2, 250))
-        msg = font2.render('Press Enter to return to menu', True, (80,80,120))
+        msg = render_text('Press Enter to return to menu', 40, (80,80,120))
         self.screen.blit(msg, (SCREEN_WIDTH//2-msg.get_width()//2, 350))
 
     def render_error(self):
         self.screen.fill((255,240,240))
-        font = pygame.font.SysFont('Arial', 60, bold=True)
-        text = font.render('Error', True, (200,0,0))
+        text = render_text('Error', 60, (200,0,0), bold=True)
         self.screen.blit(text, (SCREEN_WIDTH//2-text.get_width()//2, 120))
-        font2 = pygame.font.SysFont('Arial', 28)
         lines = self.error_message.split('\n')
         for i, line in enumerate(lines):
-            err = font2.render(line, True, (120,0,0))
+            err = render_text(line, 28, (120,0,0))
             self.screen.blit(err, (80, 220+i*32))
-        msg = font2.render('Press Enter to return to menu', True, (80,80,120))
+        prompt = 'Press Enter to return to menu' if self.initialized else 'Press Enter to quit'
+        msg = render_text(prompt, 28, (80,80,120))
         self.screen.blit(msg, (SCREEN_WIDTH//2-msg.get_width()//2, SCREEN_HEIGHT-100))
 
     def render_settings(self):
         self.screen.fill((240, 250, 255))
-        font = pygame.font.SysFont('Arial', 60, bold=True)
-        text = font.render('Settings', True, (30,30,60))
+        text = render_text('Settings', 60, (30,30,60), bold=True)
         self.screen.blit(text, (SCREEN_WIDTH//2-text.get_width()//2, 80))
-        font2 = pygame.font.SysFont('Arial', 32)
-        msg = font2.render('Drag and drop an image file to add a food item.', True, (80,80,120))
+        msg = render_text('Drag and drop an image file to add a food item.', 32, (80,80,120))
         self.screen.blit(msg, (SCREEN_WIDTH//2-msg.get_width()//2, 180))
-        msg2 = font2.render('Press ESC to return to menu. Select item and press Delete to remove.', True, (80,80,120))
+        msg2 = render_text('Press ESC to return to menu. Select item and press Delete to remove.', 32, (80,80,120))
         self.screen.blit(msg2, (SCREEN_WIDTH//2-msg2.get_width()//2, 220))
-        msg3 = font2.render('Press V for Veg, N for Non-Veg.', True, (80,80,120))
+        msg3 = render_text('Press V for Veg, N for Non-Veg, T to cycle through all zones.', 32, (80,80,120))
         self.screen.blit(msg3, (SCREEN_WIDTH//2-msg3.get_width()//2, 250))
         # Timer setting
-        font3 = pygame.font.SysFont('Arial', 32, bold=True)
-        timer_label = font3.render(f'Timer: {self.timer_setting} seconds  (←/→ to adjust)', True, (30,30,60))
+        timer_label = render_text(f'Timer: {self.timer_setting} seconds  (←/→ to adjust)', 32, (30,30,60), bold=True)
         self.screen.blit(timer_label, (SCREEN_WIDTH//2-timer_label.get_width()//2, 290))
-        # List food items
-        font4 = pygame.font.SysFont('Arial', 28)
-        for i, item in enumerate(self.food_manager.food_items):
-            color = (30,30,60) if i != self.selected_food_setting else (255,255,255)
-            if i == self.selected_food_setting:
-                bg_rect = pygame.Rect(90, 325 + i*40, 500, 36)
-                pygame.draw.rect(self.screen, (80,120,200), bg_rect, border_radius=10)
-            label = font4.render(f"{item['name']} ({item['type']})", True, color)
-            self.screen.blit(label, (100, 330 + i*40))
-
-    def render(self, frame):
+        # List food items: only the rows in view, each rendered once until its item or highlight changes
+        items = self.visible_settings_items()
+        n, rows = len(items), SETTINGS_VISIBLE_ROWS
+        self.move_settings_selection(0)
+        if self.selected_food_setting < self.settings_scroll:
+            self.settings_scroll = self.selected_food_setting
+        elif self.selected_food_setting >= self.settings_scroll + rows:
+            self.settings_scroll = self.selected_food_setting - rows + 1
+        top = self.settings_scroll = max(0, min(self.settings_scroll, n - rows))
+        cache, blits = {}, []
+        for i in range(top, min(n, top + rows)):
+            item, selected = items[i], i == self.selected_food_setting
+            key = (item['id'], selected)
+            entry = self.settings_rows.get(key)
+            if entry is None or entry[0] is not item:  # edits replace the item dict
+                entry = (item, settings_row_surface(item, selected))
+            cache[key] = entry
+            blits.append((entry[1], (90, SETTINGS_LIST_TOP + (i - top) * SETTINGS_ROW_HEIGHT)))
+        self.settings_rows = cache
+        self.screen.blits(blits, doreturn=False)
+        if n > rows:
+            track = pygame.Rect(600, SETTINGS_LIST_TOP, 6, rows * SETTINGS_ROW_HEIGHT)
+            pygame.draw.rect(self.screen, (210,220,235), track, border_radius=3)
+            thumb_h = max(20, track.height * rows // n)
+            thumb_y = track.top + (track.height - thumb_h) * top // (n - rows)
+            pygame.draw.rect(self.screen, (80,120,200), (track.left, thumb_y, track.width, thumb_h), border_radius=3)
+        # Search line
+        y = SETTINGS_LIST_TOP + rows * SETTINGS_ROW_HEIGHT + 10
+        total = len(self.food_manager.food_items)
+        if self.settings_searching or self.settings_query:
+            cursor = '_' if self.settings_searching else ''
+            line = f'Search: {self.settings_query}{cursor}   ({n} of {total})'
+        else:
+            line = f'{total} items   (/ to search, PgUp/PgDn to page)'
+        search = render_text(line, 28, (80,80,120))
+        self.screen.blit(search, (100, y))
+
+    def render(self):
         try:
-            # Convert OpenCV frame to pygame surface
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frame = np.rot90(frame)
-            frame = pygame.surfarray.make_surface(frame)
-            self.screen.blit(pygame.transform.scale(frame, (SCREEN_WIDTH, SCREEN_HEIGHT)), (0,0))
+            # Camera background, already converted and scaled by the presenter
+            self.presenter.blit(self.screen)
             # Draw drop zones
-            veg_rect, nonveg_rect = draw_drop_zones(self.screen)
-            # Draw circular menu if right hand open
+            self.zones.draw(self.screen)
+            with self.profiler.stage('particles'):
+                self.confetti.update()
+                self.emoji_rain.update()
+                self.happy_rain.update()
+            # Menu, dragged item and particles go out as one batch
+            sprites = []
+            # Circular menu if right hand open
             if hasattr(self, 'menu_center'):
-                draw_circular_menu(self.screen, self.menu_center, self.food_images, self.food_manager.food_items, self.selected_idx, self.angle_offset)
-            # Draw dragged item
+                positions, indices = self.menu_layout()
+                sprites += menu_blits(self.atlas, positions, indices, self.food_images, self.round_items,
+                                      self.selected_idx, self.zones)
+            # Dragged item
             if self.dragging and self.dragged_idx is not None:
-                img = self.food_images[self.dragged_idx]
                 x, y = self.drag_pos
-                self.screen.blit(img, (x - FOOD_ICON_SIZE//2, y - FOOD_ICON_SIZE//2))
+                sprites.append((self.food_images[self.dragged_idx], (x - FOOD_ICON_SIZE//2, y - FOOD_ICON_SIZE//2)))
+            # Confetti and emoji rain
+            for effect in (self.confetti, self.emoji_rain, self.happy_rain):
+                sprites += effect.system.blit_sequence()
+            self.screen.blits(sprites, doreturn=False)
             # Draw score and timer
             draw_score_timer(self.screen, self.score, max(0, self.time_left))
             # Draw feedback
@@ -550,35 +982,23 @@ class HandSortingGame:
                 draw_feedback(self.screen, self.feedback, self.feedback_color)
             # Hand presence cue
             if not self.hand_present:
-                font = pygame.font.SysFont('Arial', 36)
-                msg = font.render('Show your hand to start interacting!', True, (80,80,120))
+                msg = render_text('Show your hand to start interacting!', 36, (80,80,120))
                 self.screen.blit(msg, (SCREEN_WIDTH//2-msg.get_width()//2, SCREEN_HEIGHT-80))
-            # Draw confetti and emoji rain
-            self.confetti.update()
-            self.confetti.draw(self.screen)
-            self.emoji_rain.update()
-            self.emoji_rain.draw(self.screen)
-            self.happy_rain.update()
-            self.happy_rain.draw(self.screen)
         except Exception as e:
             self.screen.fill((255,240,240))
-            font = pygame.font.SysFont('Arial', 60, bold=True)
-            text = font.render('Render Error', True, (200,0,0))
+            text = render_text('Render Error', 60, (200,0,0), bold=True)
             self.screen.blit(text, (SCREEN_WIDTH//2-text.get_width()//2, 120))
-            font2 = pygame.font.SysFont('Arial', 28)
-            err = font2.render(str(e), True, (120,0,0))
+            err = render_text(str(e), 28, (120,0,0))
             self.screen.blit(err, (80, 220))
 
 def draw_score_timer(screen, score, time_left):
-    font = pygame.font.SysFont(None, 48)
-    score_text = font.render(f'Score: {score}', True, (0,0,0))
-    timer_text = font.render(f'Time: {int(time_left)}s', True, (0,0,0))
+    score_text = render_text(f'Score: {score}', 48, (0,0,0), None)
+    timer_text = render_text(f'Time: {int(time_left)}s', 48, (0,0,0), None)
     screen.blit(score_text, (SCREEN_WIDTH//2 - 120, 20))
     screen.blit(timer_text, (SCREEN_WIDTH//2 + 80, 20))
 
 def draw_feedback(screen, feedback, color):
-    font = pygame.font.SysFont(None, 64)
-    text = font.render(feedback, True, color)
+    text = render_text(feedback, 64, color, None)
     screen.blit(text, (SCREEN_WIDTH//2 - text.get_width()//2, SCREEN_HEIGHT//2 - 200))
 
 if __name__ == '__main__':
@@ -0,0 +1,108 @@
+import numpy as np
+from collections import deque
+from gestures import WRIST, INDEX_TIP
+
+KEYPOINTS = [WRIST, INDEX_TIP]
+WRIST_POINT, TIP_POINT = 0, 1  # positions within KEYPOINTS
+MAX_EXTRAPOLATION = 0.25  # seconds; past this the hand is treated as stationary
+ERROR_WINDOW = 300
+
+def _alpha(cutoff, dt):
+    tau = 1.0 / (2 * np.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+class OneEuroFilter:
+    # One-Euro filter over an array of points: adaptive low-pass on position plus a
+    # smoothed derivative, both reused for extrapolation.
+    def __init__(self, shape, min_cutoff=1.0, beta=0.007, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.x = np.zeros(shape, dtype=np.float64)
+        self.dx = np.zeros(shape, dtype=np.float64)
+        self.t = np.zeros(shape[0], dtype=np.float64)
+        self.valid = np.zeros(shape[0], dtype=bool)
+
+    def reset(self, slots=None):
+        if slots is None:
+            self.valid[:] = False
+        else:
+            self.valid[slots] = False
+
+    def update(self, x, t, slots):
+        for slot in np.flatnonzero(slots):
+            if not self.valid[slot]:
+                self.x[slot] = x[slot]
+                self.dx[slot] = 0.0
+                self.t[slot] = t
+                self.valid[slot] = True
+                continue
+            dt = t - self.t[slot]
+            if dt <= 0:
+                continue
+            dx = (x[slot] - self.x[slot]) / dt
+            self.dx[slot] += _alpha(self.d_cutoff, dt) * (dx - self.dx[slot])
+            speed = np.linalg.norm(self.dx[slot], axis=-1, keepdims=True)
+            a = _alpha(self.min_cutoff + self.beta * speed, dt)
+            self.x[slot] += a * (x[slot] - self.x[slot])
+            self.t[slot] = t
+
+    def extrapolate(self, t):
+        dt = np.clip(t - self.t, 0.0, MAX_EXTRAPOLATION)
+        return self.x + self.dx * dt.reshape((-1,) + (1,) * (self.x.ndim - 1))
+
+class LandmarkPredictor:
+    # Extrapolates wrist and index tip (pixel coords, per hand) from the last inference
+    # result to the display time, hiding inference latency from dragging and the menu.
+    def __init__(self, horizon=0.0, enabled=True, min_cutoff=1.0, beta=0.007):
+        self.horizon = horizon
+        self.enabled = enabled
+        self.filter = OneEuroFilter((2, len(KEYPOINTS), 2), min_cutoff, beta)
+        self.last_observed = np.zeros((2, len(KEYPOINTS), 2), dtype=np.float64)
+        self.predicted_errors = deque(maxlen=ERROR_WINDOW)
+        self.hold_errors = deque(maxlen=ERROR_WINDOW)
+
+    def reset(self):
+        self.filter.reset()
+        self.predicted_errors.clear()
+        self.hold_errors.clear()
+
+    def observe(self, hands_px, present, timestamp):
+        points = hands_px[:, KEYPOINTS, :].astype(np.float64)
+        tracked = present & self.filter.valid
+        if tracked.any():
+            # Score what we would have shown for this timestamp against what was seen,
+            # alongside the error of simply holding the previous observation
+            predicted = self.filter.extrapolate(timestamp)
+            err = np.linalg.norm(predicted[tracked] - points[tracked], axis=-1)
+            hold = np.linalg.norm(self.last_observed[tracked] - points[tracked], axis=-1)
+            self.predicted_errors.extend(err.ravel().tolist())
+            self.hold_errors.extend(hold.ravel().tolist())
+        self.filter.reset(~present)
+        self.filter.update(points, timestamp, present)
+        self.last_observed[present] = points[present]
+
+    def predict(self, display_time):
+        # (2, 2, 2): [hand][wrist, index tip][x, y] in pixels
+        if not self.enabled:
+            return self.last_observed.copy()
+        return self.filter.extrapolate(display_time + self.horizon)
+
+    def tracking(self, slot):
+        return bool(self.filter.valid[slot])
+
+    def stats(self):
+        def summary(errors):
+            if not errors:
+                return None, None
+            arr = np.fromiter(errors, dtype=np.float64)
+            return float(arr.mean()), float(np.percentile(arr, 95))
+        mean_pred, p95_pred = summary(self.predicted_errors)
+        mean_hold, p95_hold = summary(self.hold_errors)
+        return {
+            'samples': len(self.predicted_errors),
+            'predicted_mean_px': mean_pred,
+            'predicted_p95_px': p95_pred,
+            'hold_mean_px': mean_hold,
+            'hold_p95_px': p95_hold,
+        }
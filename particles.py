@@ -0,0 +1,142 @@
+import numpy as np
+import pygame
+
+class ParticleSystem:
+    # Structure-of-arrays particle store with a fixed capacity. Live particles are kept
+    # packed at the front in spawn order, so the oldest are always first to be evicted.
+    def __init__(self, capacity, gravity=0.0, bounds=None):
+        self.capacity = capacity
+        self.limit = capacity
+        self.gravity = gravity
+        self.bounds = bounds  # (min_x, min_y, max_x, max_y); particles leaving it die
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.int32)
+        self.sprite = np.zeros(capacity, dtype=np.int16)
+        self.count = 0
+        self.sprites = []
+        self.sprite_offsets = []
+        self.evicted = 0
+
+    def add_sprite(self, surface, anchor_center=False):
+        offset = (surface.get_width() // 2, surface.get_height() // 2) if anchor_center else (0, 0)
+        self.sprites.append(surface)
+        self.sprite_offsets.append(offset)
+        return len(self.sprites) - 1
+
+    def set_limit(self, limit):
+        self.limit = max(0, min(self.capacity, limit))
+        if self.count > self.limit:
+            self._evict(self.count - self.limit)
+
+    def _evict(self, n):
+        keep = self.count - n
+        for arr in (self.pos, self.vel, self.life, self.sprite):
+            arr[:keep] = arr[n:self.count]
+        self.count = keep
+        self.evicted += n
+
+    def spawn(self, pos, vel, life, sprite):
+        k = len(pos)
+        if k > self.limit:
+            pos, vel, life = pos[-self.limit:], vel[-self.limit:], life[-self.limit:]
+            if np.ndim(sprite):
+                sprite = sprite[-self.limit:]
+            self.evicted += k - self.limit
+            k = self.limit
+        overflow = self.count + k - self.limit
+        if overflow > 0:
+            self._evict(overflow)
+        end = self.count + k
+        self.pos[self.count:end] = pos
+        self.vel[self.count:end] = vel
+        self.life[self.count:end] = life
+        self.sprite[self.count:end] = sprite
+        self.count = end
+
+    def update(self):
+        n = self.count
+        if not n:
+            return
+        pos, vel = self.pos[:n], self.vel[:n]
+        pos += vel
+        vel[:, 1] += self.gravity
+        self.life[:n] -= 1
+        alive = self.life[:n] > 0
+        if self.bounds is not None:
+            min_x, min_y, max_x, max_y = self.bounds
+            alive &= (pos[:, 0] >= min_x) & (pos[:, 0] < max_x) & (pos[:, 1] >= min_y) & (pos[:, 1] < max_y)
+        live = int(alive.sum())
+        if live == n:
+            return
+        # Compact in place, preserving spawn order
+        for arr in (self.pos, self.vel, self.life, self.sprite):
+            arr[:live] = arr[:n][alive]
+        self.count = live
+
+    def draw(self, screen):
+        screen.blits(self.blit_sequence(), doreturn=False)
+
+    def blit_sequence(self):
+        n = self.count
+        if not n:
+            return []
+        sprites, offsets = self.sprites, self.sprite_offsets
+        xy = self.pos[:n].astype(np.int32).tolist()
+        return [(sprites[s], (x - offsets[s][0], y - offsets[s][1]))
+                for s, (x, y) in zip(self.sprite[:n].tolist(), xy)]
+
+    def clear(self):
+        self.count = 0
+
+class Confetti:
+    def __init__(self, capacity=600, radius=6):
+        self.system = ParticleSystem(capacity, gravity=0.3)
+        self.radius = radius
+        self.color_sprites = {}
+        self.rng = np.random.default_rng()
+
+    def _sprite_for(self, color):
+        sprite_id = self.color_sprites.get(tuple(color))
+        if sprite_id is None:
+            r = self.radius
+            surf = pygame.Surface((2*r, 2*r), pygame.SRCALPHA)
+            pygame.draw.circle(surf, color, (r, r), r)
+            sprite_id = self.color_sprites[tuple(color)] = self.system.add_sprite(surf, anchor_center=True)
+        return sprite_id
+
+    def spawn(self, x, y, color, count=30):
+        angle = self.rng.uniform(0, 2*np.pi, count)
+        speed = self.rng.uniform(4, 8, count)
+        pos = np.broadcast_to(np.array([x, y], dtype=np.float32), (count, 2))
+        vel = np.stack([speed*np.cos(angle), speed*np.sin(angle)], axis=1)
+        life = self.rng.integers(20, 41, count)
+        self.system.spawn(pos, vel, life, self._sprite_for(color))
+
+    def update(self):
+        self.system.update()
+
+    def draw(self, screen):
+        self.system.draw(screen)
+
+class EmojiRain:
+    def __init__(self, emoji_img, width, height, capacity=200):
+        self.width = width
+        self.system = ParticleSystem(capacity, bounds=(-np.inf, -np.inf, np.inf, height + 40))
+        self.sprite_id = self.system.add_sprite(emoji_img)
+        self.rng = np.random.default_rng()
+
+    def spawn(self, happy=False, count=10):
+        pos = np.empty((count, 2), dtype=np.float32)
+        pos[:, 0] = self.rng.integers(0, self.width - 40, count, endpoint=True)
+        pos[:, 1] = -40
+        vel = np.zeros((count, 2), dtype=np.float32)
+        vel[:, 1] = self.rng.uniform(4, 8, count)
+        life = np.iinfo(np.int32).max  # lives until it falls off the screen
+        self.system.spawn(pos, vel, np.full(count, life, dtype=np.int32), self.sprite_id)
+
+    def update(self):
+        self.system.update()
+
+    def draw(self, screen):
+        self.system.draw(screen)
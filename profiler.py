@@ -0,0 +1,174 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from text_renderer import render_text
+from ui_utils import draw_rounded_rect
+
+OVERLAY_MARGIN = 10
+WINDOW = 120  # samples kept per stage for the rolling overlay
+MAX_TRACE_EVENTS = 500000
+PROFILE_ENV = 'HAND_SORT_PROFILE'
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NULL_STAGE = _NullStage()
+
+class _NullProfiler:
+    # Stand-in for components constructed without a profiler
+    enabled = False
+
+    def stage(self, name):
+        return NULL_STAGE
+
+NULL_PROFILER = _NullProfiler()
+
+class _Stage:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+class StageProfiler:
+    # Per-stage timers for the game loop and its worker threads. When disabled, stage()
+    # hands back a shared no-op context manager, so instrumentation costs one call.
+    def __init__(self, enabled=False, trace_file='profile_trace.json'):
+        self.enabled = enabled or os.environ.get(PROFILE_ENV) == '1'
+        self.trace_file = trace_file
+        self.show_overlay = self.enabled
+        self.windows = {}
+        self.events = []
+        self.events_dropped = 0
+        self.thread_names = {}
+        self.frame_times = deque(maxlen=WINDOW)
+        self.origin = time.perf_counter_ns()
+
+    def stage(self, name):
+        if not self.enabled:
+            return NULL_STAGE
+        return _Stage(self, name)
+
+    def record(self, name, start, end):
+        window = self.windows.get(name)
+        if window is None:
+            window = self.windows[name] = deque(maxlen=WINDOW)
+        window.append(end - start)
+        if len(self.events) < MAX_TRACE_EVENTS:
+            ident = threading.get_ident()
+            if ident not in self.thread_names:
+                self.thread_names[ident] = threading.current_thread().name
+            self.events.append((name, start, end - start, ident))
+        else:
+            self.events_dropped += 1
+
+    def frame_done(self):
+        if self.enabled:
+            self.frame_times.append(time.perf_counter_ns())
+
+    def fps(self):
+        if len(self.frame_times) < 2:
+            return 0.0
+        span = self.frame_times[-1] - self.frame_times[0]
+        return (len(self.frame_times) - 1) * 1e9 / span if span else 0.0
+
+    def averages(self):
+        # Stage name -> mean milliseconds over the rolling window
+        return {name: sum(w) / len(w) / 1e6 for name, w in list(self.windows.items()) if w}
+
+    def toggle_overlay(self):
+        if self.enabled:
+            self.show_overlay = not self.show_overlay
+
+    def draw_overlay(self, screen):
+        if not (self.enabled and self.show_overlay):
+            return
+        lines = [f'FPS {self.fps():5.1f}'] + [f'{name:<14}{ms:7.2f} ms' for name, ms in self.averages().items()]
+        draw_rounded_rect(screen, (OVERLAY_MARGIN, OVERLAY_MARGIN, 260, 8 + 20 * len(lines)), (0, 0, 0, 160), 8)
+        for i, line in enumerate(lines):
+            screen.blit(render_text(line, 18, (255, 255, 255), 'Courier New'), (OVERLAY_MARGIN + 6, OVERLAY_MARGIN + 4 + 20 * i))
+
+    def export_trace(self, path=None):
+        # Chrome trace event format; opens in chrome://tracing and ui.perfetto.dev
+        path = path or self.trace_file
+        tids = {}
+        events = []
+        for name, start, dur, ident in self.events:
+            tid = tids.setdefault(ident, len(tids) + 1)
+            events.append({'name': name, 'cat': 'game', 'ph': 'X', 'pid': 1, 'tid': tid,
+                           'ts': (start - self.origin) / 1000.0, 'dur': dur / 1000.0})
+        for ident, tid in tids.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid,
+                           'args': {'name': self.thread_names.get(ident, f'thread-{tid}')}})
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms',
+                       'otherData': {'events_dropped': self.events_dropped}}, f)
+        return path
+
+class StartupTimer:
+    # Wall-clock phases of start-up, on whichever thread ran them, for the startup report.
+    # Phases also go to the stage profiler so they show up in the trace.
+    def __init__(self, profiler=NULL_PROFILER):
+        self.profiler = profiler
+        self.origin = time.perf_counter()
+        self.phases = []  # (name, thread name, start offset s, duration s)
+        self.lock = threading.Lock()
+        self.last = self.origin  # end of the previous checkpoint on the creating thread
+
+    def checkpoint(self, name):
+        # Closes a phase running from the previous checkpoint (or construction) to now;
+        # for straight-line start-up code on the main thread
+        now = time.perf_counter()
+        self.add(name, self.last, now - self.last)
+        self.last = now
+
+    def phase(self, name):
+        return _StartupPhase(self, name)
+
+    def mark(self, name):
+        # A point in time rather than a span, e.g. the first frame on screen
+        self.add(name, time.perf_counter(), 0.0)
+
+    def add(self, name, start, duration):
+        with self.lock:
+            self.phases.append((name, threading.current_thread().name, start - self.origin, duration))
+
+    def report(self):
+        with self.lock:
+            phases = sorted(self.phases, key=lambda p: p[2])
+        lines = [f"{'startup phase':<24}{'thread':<14}{'at ms':>9}{'took ms':>9}"]
+        for name, thread, at, took in phases:
+            lines.append(f'{name:<24}{thread:<14}{at * 1000:9.1f}{took * 1000:9.1f}')
+        return '\n'.join(lines)
+
+class _StartupPhase:
+    __slots__ = ('timer', 'name', 'start', 'stage')
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.stage = self.timer.profiler.stage('startup.' + self.name)
+        self.stage.__enter__()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.add(self.name, self.start, time.perf_counter() - self.start)
+        self.stage.__exit__(*exc)
+        return False
@@ -0,0 +1,186 @@
+import argparse
+import json
+import os
+import time
+import numpy as np
+from gestures import NUM_LANDMARKS
+
+# A recording is a directory with:
+#   landmarks.f32  raw float32 (frames, 2, 21, 3) hand array, appended as frames arrive
+#   index.bin      raw records of INDEX_DTYPE, one per frame
+#   ticks.f64      float64 times of the motion predictions made between frames
+#   meta.json      format version and predictor settings, written on open; frame count added on close
+# The binary files are plain arrays, so replay memory-maps them instead of parsing.
+# With motion prediction on, the game acts on positions extrapolated to the moment it
+# handles each frame and to every display tick in between, so those moments are recorded
+# too and replay runs the predictor on the same clock. Times are seconds since the first frame.
+LANDMARKS_FILE = 'landmarks.f32'
+INDEX_FILE = 'index.bin'
+TICKS_FILE = 'ticks.f64'
+META_FILE = 'meta.json'
+FORMAT_VERSION = 2
+FRAME_SHAPE = (2, NUM_LANDMARKS, 3)
+# timestamp: capture time; now: when the game handled it; present: bit 0 = left, bit 1 = right
+INDEX_DTYPE = np.dtype([('timestamp', '<f8'), ('present', 'u1'), ('now', '<f8')])
+INDEX_DTYPE_V1 = np.dtype([('timestamp', '<f8'), ('present', 'u1')])  # no prediction times; no meta until close
+
+def new_recording_path(root):
+    # One directory per round, named by its start time; rounds started in the same second get a suffix
+    base = os.path.join(root, time.strftime('%Y%m%d-%H%M%S'))
+    path, n = base, 1
+    while True:
+        try:
+            os.makedirs(path)
+            return path
+        except FileExistsError:
+            n += 1
+            path = f'{base}-{n}'
+
+class LandmarkRecorder:
+    def __init__(self, path, prediction=False, horizon=0.0):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.meta = {'version': FORMAT_VERSION, 'shape': list(FRAME_SHAPE), 'prediction': prediction, 'horizon': horizon}
+        self._write_meta()
+        self.landmarks = open(os.path.join(path, LANDMARKS_FILE), 'wb')
+        self.index = open(os.path.join(path, INDEX_FILE), 'wb')
+        self.ticks = open(os.path.join(path, TICKS_FILE), 'wb')
+        self.start = None
+        self.frames = 0
+        self.record_buf = np.zeros(1, dtype=INDEX_DTYPE)
+        self.tick_buf = np.zeros(1, dtype='<f8')
+
+    def _write_meta(self):
+        with open(os.path.join(self.path, META_FILE), 'w') as f:
+            json.dump(self.meta, f)
+
+    def record(self, hands, present, timestamp, now=None):
+        if self.landmarks is None:
+            return
+        if self.start is None:
+            self.start = timestamp
+        self.landmarks.write(np.ascontiguousarray(hands, dtype=np.float32).tobytes())
+        self.record_buf['timestamp'] = timestamp - self.start
+        self.record_buf['present'] = int(present[0]) | (int(present[1]) << 1)
+        self.record_buf['now'] = (timestamp if now is None else now) - self.start
+        self.index.write(self.record_buf.tobytes())
+        self.frames += 1
+
+    def tick(self, now):
+        # A prediction made between frames; before the first frame there is nothing to predict
+        if self.ticks is None or self.start is None:
+            return
+        self.tick_buf[0] = now - self.start
+        self.ticks.write(self.tick_buf.tobytes())
+
+    def close(self):
+        if self.landmarks is None:
+            return
+        for f in (self.landmarks, self.index, self.ticks):
+            f.close()
+        self.landmarks = self.index = self.ticks = None
+        self.meta['frames'] = self.frames
+        self._write_meta()
+
+class LandmarkReplay:
+    def __init__(self, path):
+        self.path = path
+        meta_path = os.path.join(path, META_FILE)
+        self.meta = {}
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                self.meta = json.load(f)
+        # Version 1 wrote meta.json only on close, so a recording without one is version 1
+        self.version = self.meta.get('version', 1)
+        dtype = INDEX_DTYPE if self.version >= 2 else INDEX_DTYPE_V1
+        index_path = os.path.join(path, INDEX_FILE)
+        # Frame count comes from the index, so a recording cut short by a crash still replays
+        frames = os.path.getsize(index_path) // dtype.itemsize
+        self.index = np.memmap(index_path, dtype=dtype, mode='r', shape=(frames,)) if frames else np.zeros(0, dtype)
+        lm_path = os.path.join(path, LANDMARKS_FILE)
+        frames = min(frames, os.path.getsize(lm_path) // (np.prod(FRAME_SHAPE) * 4))
+        self.landmarks = (np.memmap(lm_path, dtype=np.float32, mode='r', shape=(frames,) + FRAME_SHAPE)
+                          if frames else np.zeros((0,) + FRAME_SHAPE, np.float32))
+        self.index = self.index[:frames]
+        bits = self.index['present']
+        self.present = np.stack([(bits & 1) != 0, (bits & 2) != 0], axis=1)
+        self.timestamps = self.index['timestamp']
+        self.handled = self.index['now'] if self.version >= 2 else self.timestamps
+        ticks_path = os.path.join(path, TICKS_FILE)
+        self.ticks = (np.fromfile(ticks_path, dtype='<f8') if self.version >= 2 and os.path.exists(ticks_path)
+                      else np.zeros(0, '<f8'))
+
+    def __len__(self):
+        return len(self.landmarks)
+
+    def __iter__(self):
+        # Plain ndarray views skip memmap's per-item subclass overhead
+        landmarks = self.landmarks.view(np.ndarray)
+        timestamps = np.asarray(self.timestamps, dtype=np.float64).tolist()
+        for i in range(len(self)):
+            yield landmarks[i], self.present[i], timestamps[i]
+
+    def drive(self, game, realtime=False):
+        # Feeds the recording straight into the game logic; no camera, inference or drawing.
+        # Runs on the recording's own clock so scoring and timeouts are reproducible. Motion
+        # prediction runs as it did live, at the recorded moments; version 1 recordings
+        # don't have those, so it is off for them.
+        game.predictor.enabled = bool(self.meta.get('prediction', False)) and self.version >= 2
+        game.predictor.horizon = self.meta.get('horizon', game.predictor.horizon)
+        game.predictor.reset()
+        base = time.time()
+        game.start_time = base
+        wall_start = time.perf_counter()
+        ticks = self.ticks.tolist()
+        handled = np.asarray(self.handled, dtype=np.float64).tolist()
+        next_tick = 0
+        for (hands, present, t), now in zip(self, handled):
+            # Display ticks that came before this frame was handled, in their original order
+            while next_tick < len(ticks) and ticks[next_tick] < now:
+                tick = ticks[next_tick]
+                next_tick += 1
+                self._wait(realtime, wall_start, tick)
+                game.apply_prediction(now=tick)
+                game.update_game(now=base + tick)
+            self._wait(realtime, wall_start, now)
+            game.hand_present = bool(present.any())
+            game.process_hand_array(hands, present, t, now=now)
+            game.update_game(now=base + now)
+            if game.state != 'playing':
+                break
+
+    def _wait(self, realtime, wall_start, t):
+        if realtime:
+            delay = t - (time.perf_counter() - wall_start)
+            if delay > 0:
+                time.sleep(delay)
+
+def replay_main(args):
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    from main import HandSortingGame
+    replay = LandmarkReplay(args.path)
+    game = HandSortingGame(headless=True, log_file=os.devnull, use_camera=False)
+    if not game.initialized:
+        raise SystemExit(game.error_message)
+    frames = 0
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        game.reset_game()
+        game.state = 'playing'
+        replay.drive(game, realtime=args.realtime)
+        frames += len(replay)
+        print(f'round: state={game.state} score={game.score} items_left={len(game.round_items)}')
+    elapsed = time.perf_counter() - started
+    print(f'{frames} frames in {elapsed:.3f} s ({frames / elapsed if elapsed else 0:.0f} frames/s)')
+    if game.state == 'error':
+        print(game.error_message)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay a recorded landmark session through the game logic.')
+    parser.add_argument('path', help='recording directory')
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--realtime', action='store_true', help='replay at the recorded pace')
+    replay_main(parser.parse_args(argv))
+
+if __name__ == '__main__':
+    main()
@@ -8,7 +8,33 @@ class Settings:
         self.camera_on = True
         self.sound_on = True
         self.game_duration = 60  # seconds
+        self.target_fps = 30
+        self.capture_source = 'webcam'  # webcam, video, images or synthetic
+        self.capture_path = ''  # video file or image directory for the video/images sources
+        self.camera_index = 0
+        self.camera_width = 0  # requested capture format; 0 or '' keeps the driver's default
+        self.camera_height = 0
+        self.camera_fps = 0
+        self.camera_fourcc = ''  # e.g. 'MJPG' for full frame rate at high resolutions on USB cameras
+        self.camera_buffer_size = 1  # frames queued in the driver; 1 = lowest latency
+        self.adaptive_quality = True  # step effects/inference quality down when frames run over budget
         self.food_items_file = 'food_items.json'
+        self.drop_zones = []  # [{"type", "label", "color"}, ...]; empty = veg/non-veg. Catalog types without a zone get one.
+        self.menu_window = 8  # ring slots; larger rounds scroll through a window of this many items
+        self.inference_every_n = 1  # run hand inference on every Nth camera frame
+        self.inference_hz = 0  # cap on inference rate, 0 = as fast as frames arrive
+        self.inference_roi = False  # infer on a crop around the last seen hands instead of the whole frame
+        self.inference_roi_size = 256  # longest side the crop is downsampled to
+        self.inference_full_search_every = 15  # full-frame search this often, to find new hands
+        self.motion_prediction = True  # extrapolate hand positions between inference results
+        self.prediction_horizon_ms = 0  # extra look-ahead past the display time
+        self.log_batching = True  # buffer log rows and write them from a background thread
+        self.log_flush_rows = 50
+        self.log_flush_interval_ms = 1000
+        self.log_max_bytes = 5 * 1024 * 1024  # rotate game_log.csv past this size, 0 = never
+        self.record_landmarks = ''  # directory to record each round's hand landmarks into, '' = off
+        self.profiling = False  # per-stage timers, F3 overlay and a trace on exit (or HAND_SORT_PROFILE=1)
+        self.profile_trace_file = 'profile_trace.json'
         self.load()
 
     def load(self):
@@ -18,7 +44,33 @@ class Settings:
                 self.camera_on = data.get('camera_on', True)
                 self.sound_on = data.get('sound_on', True)
                 self.game_duration = data.get('game_duration', 60)
+                self.target_fps = data.get('target_fps', 30)
+                self.capture_source = data.get('capture_source', 'webcam')
+                self.capture_path = data.get('capture_path', '')
+                self.camera_index = data.get('camera_index', 0)
+                self.camera_width = data.get('camera_width', 0)
+                self.camera_height = data.get('camera_height', 0)
+                self.camera_fps = data.get('camera_fps', 0)
+                self.camera_fourcc = data.get('camera_fourcc', '')
+                self.camera_buffer_size = data.get('camera_buffer_size', 1)
+                self.adaptive_quality = data.get('adaptive_quality', True)
                 self.food_items_file = data.get('food_items_file', 'food_items.json')
+                self.drop_zones = data.get('drop_zones', [])
+                self.menu_window = data.get('menu_window', 8)
+                self.inference_every_n = data.get('inference_every_n', 1)
+                self.inference_hz = data.get('inference_hz', 0)
+                self.inference_roi = data.get('inference_roi', False)
+                self.inference_roi_size = data.get('inference_roi_size', 256)
+                self.inference_full_search_every = data.get('inference_full_search_every', 15)
+                self.motion_prediction = data.get('motion_prediction', True)
+                self.prediction_horizon_ms = data.get('prediction_horizon_ms', 0)
+                self.log_batching = data.get('log_batching', True)
+                self.log_flush_rows = data.get('log_flush_rows', 50)
+                self.log_flush_interval_ms = data.get('log_flush_interval_ms', 1000)
+                self.log_max_bytes = data.get('log_max_bytes', 5 * 1024 * 1024)
+                self.record_landmarks = data.get('record_landmarks', '')
+                self.profiling = data.get('profiling', False)
+                self.profile_trace_file = data.get('profile_trace_file', 'profile_trace.json')
 
     def save(self):
         with open(SETTINGS_FILE, 'w') as f:
@@ -26,7 +78,33 @@ class Settings:
                 'camera_on': self.camera_on,
                 'sound_on': self.sound_on,
                 'game_duration': self.game_duration,
-                'food_items_file': self.food_items_file
+                'target_fps': self.target_fps,
+                'capture_source': self.capture_source,
+                'capture_path': self.capture_path,
+                'camera_index': self.camera_index,
+                'camera_width': self.camera_width,
+                'camera_height': self.camera_height,
+                'camera_fps': self.camera_fps,
+                'camera_fourcc': self.camera_fourcc,
+                'camera_buffer_size': self.camera_buffer_size,
+                'adaptive_quality': self.adaptive_quality,
+                'food_items_file': self.food_items_file,
+                'drop_zones': self.drop_zones,
+                'menu_window': self.menu_window,
+                'inference_every_n': self.inference_every_n,
+                'inference_hz': self.inference_hz,
+                'inference_roi': self.inference_roi,
+                'inference_roi_size': self.inference_roi_size,
+                'inference_full_search_every': self.inference_full_search_every,
+                'motion_prediction': self.motion_prediction,
+                'prediction_horizon_ms': self.prediction_horizon_ms,
+                'log_batching': self.log_batching,
+                'log_flush_rows': self.log_flush_rows,
+                'log_flush_interval_ms': self.log_flush_interval_ms,
+                'log_max_bytes': self.log_max_bytes,
+                'record_landmarks': self.record_landmarks,
+                'profiling': self.profiling,
+                'profile_trace_file': self.profile_trace_file
             }, f, indent=4)
 
     def update(self, **kwargs):
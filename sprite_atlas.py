@@ -0,0 +1,62 @@
+import pygame
+from collections import OrderedDict
+
+ATLAS_COLUMNS = 16
+ATLAS_CAPACITY = 128
+
+class SpriteAtlas:
+    # One surface of equal-sized tiles, composited once and then blitted by sub-rect, so a
+    # frame's sprites can all go out in a single Surface.blits call. Tiles are built on
+    # first use and recycled least-recently-used, so memory is bounded by capacity rather
+    # than by catalog size. Capacity must cover everything drawn in one frame.
+    def __init__(self, tile, capacity=ATLAS_CAPACITY, columns=ATLAS_COLUMNS):
+        self.tile = tile
+        self.capacity = capacity
+        self.columns = columns
+        self.surface = None
+        self.slots = OrderedDict()  # key -> (slot number, area rect)
+        self.free = list(range(capacity - 1, -1, -1))
+        self.builds = 0
+
+    def _ensure_surface(self):
+        if self.surface is None:
+            rows = -(-self.capacity // self.columns)
+            surf = pygame.Surface((self.columns * self.tile, rows * self.tile), pygame.SRCALPHA)
+            if pygame.display.get_init() and pygame.display.get_surface() is not None:
+                surf = surf.convert_alpha()
+            self.surface = surf
+        return self.surface
+
+    def slot_rect(self, slot):
+        return pygame.Rect((slot % self.columns) * self.tile, (slot // self.columns) * self.tile, self.tile, self.tile)
+
+    def get(self, key, compose, *args):
+        # Sub-rect holding key's tile; compose(tile, *args) draws it the first time
+        entry = self.slots.get(key)
+        if entry is not None:
+            self.slots.move_to_end(key)
+            return entry[1]
+        surface = self._ensure_surface()
+        if self.free:
+            slot = self.free.pop()
+        else:
+            _, (slot, _) = self.slots.popitem(last=False)
+        rect = self.slot_rect(slot)
+        surface.fill((0, 0, 0, 0), rect)
+        compose(surface.subsurface(rect), *args)
+        self.slots[key] = (slot, rect)
+        self.builds += 1
+        return rect
+
+    def invalidate(self):
+        # Call when the pixels behind any key may have changed (icons loaded, zone colours)
+        self.slots.clear()
+        self.free = list(range(self.capacity - 1, -1, -1))
+
+    def reset_display(self):
+        # The old surface was converted for a previous display
+        self.surface = None
+        self.invalidate()
+
+    def stats(self):
+        return {'tiles': len(self.slots), 'capacity': self.capacity, 'builds': self.builds}
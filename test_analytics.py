@@ -0,0 +1,83 @@
+import os
+import numpy as np
+from analytics import SessionAnalytics
+from logger import HEADER
+
+FOODS = [('Apple', 'veg'), ('Fish', 'non-veg'), ('Egg', 'non-veg'), ('Carrot', 'veg')]
+
+def make_rows(n, start=0):
+    # Rows as the logger writes them; a wrong drop every third row, a new session every 25
+    rows, score = [], 0
+    for i in range(start, start + n):
+        if i % 25 == 0:
+            score = 0
+        name, kind = FOODS[i % len(FOODS)]
+        correct = i % 3 != 0
+        dropped = kind if correct else ('veg' if kind == 'non-veg' else 'non-veg')
+        score += 10 if correct else -5
+        ts = f'2025-07-09T12:{i // 60 % 60:02d}:{i % 60:02d}'
+        rows.append(f"{ts},{name},{kind},{dropped},{'correct' if correct else 'incorrect'},{score}\n")
+    return rows
+
+def write(path, rows, header=True, mode='w'):
+    with open(path, mode) as f:
+        if header:
+            f.write(','.join(HEADER) + '\n')
+        f.writelines(rows)
+
+def summary(analytics):
+    cols = analytics.columns()
+    vocab = np.array(analytics.state['vocab'], dtype=object)
+    decoded = {k: (vocab[v].tolist() if k in ('food', 'classification', 'dropped_in') else v.tolist())
+               for k, v in cols.items()}
+    state = {k: analytics.state[k] for k in ('rows', 'foods', 'confusion', 'sessions')}
+    return state, decoded
+
+def rebuild(tmp_path, rows):
+    log = str(tmp_path / 'full.csv')
+    write(log, rows)
+    analytics = SessionAnalytics(log, str(tmp_path / 'full_cache'))
+    analytics.update()
+    return summary(analytics)
+
+def test_incremental_runs_match_full_rebuild(tmp_path):
+    rows = make_rows(120)
+    log = str(tmp_path / 'game_log.csv')
+    analytics = SessionAnalytics(log, str(tmp_path / 'cache'))
+    write(log, rows[:40])
+    assert analytics.update() == 40
+    write(log, rows[40:90], header=False, mode='a')
+    # A fresh instance resumes from the checkpoint on disk
+    analytics = SessionAnalytics(log, str(tmp_path / 'cache'))
+    assert analytics.update() == 50
+    write(log, rows[90:], header=False, mode='a')
+    assert analytics.update() == 30
+    assert analytics.update() == 0
+    assert summary(analytics) == rebuild(tmp_path, rows)
+
+def test_rotation_between_runs_keeps_every_row(tmp_path):
+    rows = make_rows(100)
+    log = str(tmp_path / 'game_log.csv')
+    analytics = SessionAnalytics(log, str(tmp_path / 'cache'))
+    write(log, rows[:30])
+    assert analytics.update() == 30
+    # More rows land in the old file, then it is rotated away (twice) before the next run
+    write(log, rows[30:50], header=False, mode='a')
+    os.replace(log, log + '.1')
+    write(log, rows[50:70])
+    os.replace(log + '.1', log + '.2')
+    os.replace(log, log + '.1')
+    write(log, rows[70:])
+    assert analytics.update() == 70
+    assert summary(analytics) == rebuild(tmp_path, rows)
+
+def test_torn_final_line_waits_for_next_run(tmp_path):
+    rows = make_rows(20)
+    log = str(tmp_path / 'game_log.csv')
+    analytics = SessionAnalytics(log, str(tmp_path / 'cache'))
+    torn = rows[10][:12]
+    write(log, rows[:10] + [torn])
+    assert analytics.update() == 10
+    write(log, [rows[10][12:]] + rows[11:], header=False, mode='a')
+    assert analytics.update() == 10
+    assert summary(analytics) == rebuild(tmp_path, rows)
@@ -0,0 +1,78 @@
+import json
+import os
+from food_manager import FoodManager
+
+LEGACY = [
+    {'name': 'Apple', 'image': 'images/apple.png', 'type': 'veg'},
+    {'name': 'Fish', 'image': 'images/fish.png', 'type': 'non-veg'},
+    {'name': 'Egg', 'image': 'images/egg.png', 'type': 'non-veg'},
+]
+
+def write_legacy(path):
+    with open(path, 'w') as f:
+        json.dump(LEGACY, f)
+
+def test_legacy_list_is_migrated_before_journaling(tmp_path):
+    path = str(tmp_path / 'food_items.json')
+    write_legacy(path)
+    fm = FoodManager(path)
+    with open(path) as f:
+        data = json.load(f)
+    assert isinstance(data, dict)
+    assert [item['id'] for item in data['items']] == [1, 2, 3]
+    egg = fm.find('egg')
+    fm.update_item(egg['id'], type='veg')
+    # Hand-edit the snapshot while the app is closed: the journalled edit must follow Egg, not a position
+    data['items'] = [item for item in data['items'] if item['name'] != 'Apple']
+    with open(path, 'w') as f:
+        json.dump(data, f)
+    fm = FoodManager(path)
+    assert [item['name'] for item in fm.food_items] == ['Fish', 'Egg']
+    assert fm.find('egg')['type'] == 'veg'
+    assert fm.find('fish')['type'] == 'non-veg'
+
+def test_journal_replays_without_compaction(tmp_path):
+    path = str(tmp_path / 'food_items.json')
+    fm = FoodManager(path)
+    first = fm.add_food_item('Rice', 'images/rice.png', 'veg')
+    second = fm.add_food_item('Chicken', 'images/chicken.png', 'non-veg')
+    fm.update_item(first, name='Brown Rice')
+    fm.remove_item(second)
+    fm = FoodManager(path)
+    assert [(item['id'], item['name']) for item in fm.food_items] == [(first, 'Brown Rice')]
+    assert fm.add_food_item('Dal', 'images/dal.png', 'veg') == second + 1
+
+def test_torn_journal_line_is_truncated(tmp_path):
+    path = str(tmp_path / 'food_items.json')
+    fm = FoodManager(path)
+    fm.add_food_item('Rice', 'images/rice.png', 'veg')
+    journal = fm.journal_file
+    good_size = os.path.getsize(journal)
+    with open(journal, 'a') as f:
+        f.write('{"op": "add", "item": {"id": 2, "na')
+    fm = FoodManager(path)
+    assert [item['name'] for item in fm.food_items] == ['Rice']
+    assert os.path.getsize(journal) == good_size
+    # The next edit starts on a clean line and survives a reload
+    fm.add_food_item('Dal', 'images/dal.png', 'veg')
+    assert [item['name'] for item in FoodManager(path).food_items] == ['Rice', 'Dal']
+
+def test_unterminated_final_line_is_not_applied(tmp_path):
+    # A complete op whose newline never reached the disk was never acknowledged
+    path = str(tmp_path / 'food_items.json')
+    fm = FoodManager(path)
+    fm.add_food_item('Rice', 'images/rice.png', 'veg')
+    with open(fm.journal_file, 'a') as f:
+        f.write(json.dumps({'op': 'remove', 'id': 1}))
+    fm = FoodManager(path)
+    assert [item['name'] for item in fm.food_items] == ['Rice']
+    fm.add_food_item('Dal', 'images/dal.png', 'veg')
+    assert [item['name'] for item in FoodManager(path).food_items] == ['Rice', 'Dal']
+
+def test_compaction_folds_journal_into_snapshot(tmp_path):
+    path = str(tmp_path / 'food_items.json')
+    fm = FoodManager(path, compact_after=3)
+    for name in ('Rice', 'Dal', 'Egg'):
+        fm.add_food_item(name, f'images/{name.lower()}.png', 'veg')
+    assert os.path.getsize(fm.journal_file) == 0
+    assert [item['name'] for item in FoodManager(path).food_items] == ['Rice', 'Dal', 'Egg']
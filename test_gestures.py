@@ -0,0 +1,36 @@
+import numpy as np
+from gestures import closest_ring_item, ring_window
+
+def test_closest_ring_item_matches_nearest_point():
+    rng = np.random.default_rng(0)
+    center = (640, 360)
+    for n in (1, 2, 5, 12):
+        for _ in range(50):
+            offset = rng.uniform(-np.pi, np.pi)
+            pos = rng.uniform(0, 1280), rng.uniform(0, 720)
+            # The original per-item loop: item i sits at angle 2*pi*i/n + offset
+            angles = 2 * np.pi * np.arange(n) / n + offset
+            xs, ys = center[0] + 150 * np.cos(angles), center[1] + 150 * np.sin(angles)
+            nearest = int(np.argmin(np.hypot(xs - pos[0], ys - pos[1])))
+            assert closest_ring_item(pos, center, offset, n) == nearest
+
+def test_closest_ring_item_empty_ring():
+    assert closest_ring_item((10, 10), (0, 0), 0.0, 0) == 0
+
+def test_ring_window_centres_selection():
+    selected, indices, angles = ring_window(3.0, 100, 8)
+    assert selected == 3
+    assert indices.tolist() == [99, 0, 1, 2, 3, 4, 5, 6]
+    # The selection's slot is at angle 0 and slots are evenly spaced around the ring
+    assert angles[4] == 0
+    assert np.allclose(np.diff(angles), 2 * np.pi / 8)
+
+def test_ring_window_fractional_scroll_and_wrap():
+    selected, indices, angles = ring_window(98.7, 100, 5)
+    assert selected == 99
+    assert indices.tolist() == [97, 98, 99, 0, 1]
+    assert np.isclose(angles[2], 0.3 * 2 * np.pi / 5)
+    # Scrolling backwards past zero wraps the same way
+    selected, indices, _ = ring_window(-1.2, 100, 5)
+    assert selected == 99
+    assert indices.tolist() == [97, 98, 99, 0, 1]
@@ -0,0 +1,50 @@
+import numpy as np
+from gestures import empty_hands
+from inference import ROI_MIN_SIDE, hands_roi, roi_to_frame
+
+W, H = 640, 480
+
+def hands_at(x0, y0, x1, y1, present=(False, True)):
+    # Right hand spread over the given normalized box, left hand far away but absent
+    hands, _ = empty_hands()
+    rng = np.random.default_rng(0)
+    hands[1, :, 0] = rng.uniform(x0, x1, hands.shape[1])
+    hands[1, :, 1] = rng.uniform(y0, y1, hands.shape[1])
+    hands[1, 0, :2] = x0, y0
+    hands[1, 1, :2] = x1, y1
+    hands[0, :, :2] = 0.99
+    return hands, np.array(present)
+
+def test_roi_pads_present_hands_and_stays_in_frame():
+    hands, present = hands_at(0.4, 0.4, 0.6, 0.7)
+    x, y, w, h, fw, fh = hands_roi(hands, present, W, H)
+    assert (fw, fh) == (W, H)
+    assert 0 <= x and 0 <= y and x + w <= W and y + h <= H
+    assert x < 0.4 * W and 0.6 * W < x + w and y < 0.4 * H and 0.7 * H < y + h
+    # The absent hand at the far corner is not included
+    assert x + w < 0.99 * W
+
+def test_roi_has_minimum_side_and_clips_at_edges():
+    hands, present = hands_at(0.98, 0.98, 0.99, 0.99)
+    x, y, w, h, _, _ = hands_roi(hands, present, W, H)
+    assert x + w == W and y + h == H
+    assert w >= ROI_MIN_SIDE * H / 2 and h >= ROI_MIN_SIDE * H / 2
+
+def test_current_roi_kept_until_hands_near_its_edge():
+    hands, present = hands_at(0.45, 0.45, 0.55, 0.55)
+    current = (100, 100, 440, 280, W, H)
+    assert hands_roi(hands, present, W, H, current) is current
+    hands, present = hands_at(0.15, 0.45, 0.25, 0.55)
+    assert hands_roi(hands, present, W, H, current) != current
+
+def test_roi_to_frame_inverts_crop_normalization():
+    hands, present = hands_at(0.3, 0.2, 0.5, 0.6)
+    hands[..., 2] = 0.05
+    roi = hands_roi(hands, present, W, H)
+    x, y, w, h, _, _ = roi
+    cropped = hands.copy()
+    cropped[..., 0] = (hands[..., 0] * W - x) / w
+    cropped[..., 1] = (hands[..., 1] * H - y) / h
+    cropped[..., 2] = hands[..., 2] * W / w
+    roi_to_frame(cropped, roi)
+    assert np.allclose(cropped, hands, atol=1e-5)
@@ -0,0 +1,42 @@
+import numpy as np
+from particles import ParticleSystem
+
+def spawn(system, start, k, life=100):
+    # Particle i sits at x = i, so positions say which particles survived
+    xs = np.arange(start, start + k, dtype=np.float32)
+    pos = np.stack([xs, np.zeros(k, np.float32)], axis=1)
+    system.spawn(pos, np.zeros((k, 2), np.float32), np.full(k, life), 0)
+
+def xs(system):
+    return system.pos[:system.count, 0].astype(int).tolist()
+
+def test_full_system_evicts_oldest_first():
+    system = ParticleSystem(5)
+    spawn(system, 0, 4)
+    spawn(system, 4, 3)
+    assert xs(system) == [2, 3, 4, 5, 6]
+    assert system.evicted == 2
+
+def test_burst_larger_than_limit_keeps_newest():
+    system = ParticleSystem(5)
+    spawn(system, 0, 2)
+    spawn(system, 2, 8)
+    assert xs(system) == [5, 6, 7, 8, 9]
+    assert system.evicted == 5
+
+def test_lowering_limit_evicts_oldest_and_caps_spawns():
+    system = ParticleSystem(6)
+    spawn(system, 0, 6)
+    system.set_limit(3)
+    assert xs(system) == [3, 4, 5]
+    spawn(system, 6, 1)
+    assert xs(system) == [4, 5, 6]
+    assert system.evicted == 4
+
+def test_update_drops_dead_particles_in_spawn_order():
+    system = ParticleSystem(8, bounds=(0, -10, 100, 10))
+    spawn(system, 0, 3, life=1)
+    spawn(system, 3, 3, life=5)
+    spawn(system, 200, 1, life=5)  # out of bounds
+    system.update()
+    assert xs(system) == [3, 4, 5]
@@ -0,0 +1,27 @@
+import pygame
+from zones import DEFAULT_ZONES, ZoneLayout
+
+SCREEN = (1280, 720)
+
+def layout(n):
+    return ZoneLayout([{'type': f't{i}'} for i in range(n)], SCREEN)
+
+def test_default_zones_keep_original_boxes():
+    zones = ZoneLayout(DEFAULT_ZONES, SCREEN).zones
+    assert [z.rect for z in zones] == [pygame.Rect(40, 160, 180, 180), pygame.Rect(40, 380, 180, 180)]
+
+def test_many_zones_stay_on_screen_without_overlap():
+    screen = pygame.Rect((0, 0), SCREEN)
+    for n in (37, 48, 100):
+        rects = [z.rect for z in layout(n).zones]
+        assert all(screen.contains(r) for r in rects)
+        assert not any(r.collidelist(rects[:i]) != -1 for i, r in enumerate(rects))
+
+def test_hit_finds_each_zone_and_misses_outside():
+    zl = layout(48)
+    for zone in zl.zones:
+        assert zl.hit(zone.rect.center) is zone
+        # Edges are outside, as in the original strict test
+        assert zl.hit(zone.rect.topleft) is None
+    assert zl.hit((SCREEN[0] // 2, SCREEN[1] // 2)) is None
+    assert zl.hit(None) is None
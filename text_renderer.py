@@ -0,0 +1,59 @@
+import pygame
+from collections import OrderedDict
+
+MAX_CACHED_SURFACES = 256
+
+class TextRenderer:
+    # Fonts are resolved once per (name, size, bold); rendered text surfaces are kept
+    # in a bounded LRU so static labels cost a dict lookup instead of a rasterisation.
+    def __init__(self, max_surfaces=MAX_CACHED_SURFACES):
+        self.max_surfaces = max_surfaces
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def font(self, name, size, bold=False):
+        key = (name, size, bold)
+        font = self.fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = self.fonts[key] = pygame.font.SysFont(name, size, bold=bold)
+        return font
+
+    def render(self, text, size, color, name='Arial', bold=False):
+        key = (name, size, bold, text, tuple(color))
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = self.font(name, size, bold).render(text, True, color)
+        self.surfaces[key] = surf
+        if len(self.surfaces) > self.max_surfaces:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return surf
+
+    def clear(self):
+        self.fonts.clear()
+        self.surfaces.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'fonts': len(self.fonts),
+            'surfaces': len(self.surfaces),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+text_renderer = TextRenderer()
+
+def render_text(text, size, color, name='Arial', bold=False):
+    return text_renderer.render(text, size, color, name, bold)
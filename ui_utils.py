@@ -1,8 +1,62 @@
 import pygame
 import math
+import numpy as np
+from collections import OrderedDict
 
-def draw_rounded_rect(surface, rect, color, radius=20, border=0, border_color=(0,0,0)):
-    x, y, w, h = rect
+SURFACE_CACHE_BYTES = 32 * 1024 * 1024
+
+class SurfaceCache:
+    # LRU of generated surfaces, bounded by total pixel memory rather than entry count
+    def __init__(self, max_bytes=SURFACE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, build):
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = build()
+        self.entries[key] = surf
+        self.bytes += _surface_bytes(surf)
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _, old = self.entries.popitem(last=False)
+            self.bytes -= _surface_bytes(old)
+        return surf
+
+    def invalidate(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return {'entries': len(self.entries), 'bytes': self.bytes, 'hits': self.hits, 'misses': self.misses}
+
+def _surface_bytes(surf):
+    return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+def _display_format(surf, alpha=False):
+    # Match the display's pixel format when there is one so blits skip conversion
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        return surf.convert_alpha() if alpha else surf.convert()
+    return surf
+
+surface_cache = SurfaceCache()
+
+def invalidate_surface_cache():
+    # Call when the window size or display format changes
+    surface_cache.invalidate()
+
+def rounded_rect_surface(size, color, radius=20, border=0, border_color=(0,0,0)):
+    key = ('rounded_rect', size, tuple(color), radius, border, tuple(border_color))
+    return surface_cache.get(key, lambda: _build_rounded_rect(size, color, radius, border, border_color))
+
+def _build_rounded_rect(size, color, radius, border, border_color):
+    w, h = size
     shape_surf = pygame.Surface((w, h), pygame.SRCALPHA)
     pygame.draw.rect(shape_surf, color, (radius, 0, w-2*radius, h))
     pygame.draw.rect(shape_surf, color, (0, radius, w, h-2*radius))
@@ -13,28 +67,88 @@ def draw_rounded_rect(surface, rect, color, radius=20, border=0, border_color=(0
     if border > 0:
         pygame.draw.rect(shape_surf, border_color, (radius, 0, w-2*radius, h), border)
         pygame.draw.rect(shape_surf, border_color, (0, radius, w, h-2*radius), border)
-    surface.blit(shape_surf, (x, y))
+    return _display_format(shape_surf, alpha=True)
+
+def draw_rounded_rect(surface, rect, color, radius=20, border=0, border_color=(0,0,0)):
+    x, y, w, h = rect
+    surface.blit(rounded_rect_surface((w, h), color, radius, border, border_color), (x, y))
+
+def gradient_surface(size, color1, color2, vertical=True):
+    key = ('gradient', size, tuple(color1[:3]), tuple(color2[:3]), vertical)
+    return surface_cache.get(key, lambda: _build_gradient(size, color1, color2, vertical))
+
+def _build_gradient(size, color1, color2, vertical):
+    w, h = size
+    n = h if vertical else w
+    c1 = np.array(color1[:3], dtype=np.float64)
+    c2 = np.array(color2[:3], dtype=np.float64)
+    t = np.arange(n, dtype=np.float64)[:, None] / n
+    ramp = (c1 + t * (c2 - c1)).astype(np.uint8)  # (n, 3), truncated like int()
+    # surfarray is indexed [x, y]
+    if vertical:
+        pixels = np.broadcast_to(ramp[None, :, :], (w, h, 3))
+    else:
+        pixels = np.broadcast_to(ramp[:, None, :], (w, h, 3))
+    surf = pygame.Surface((w, h))
+    pygame.surfarray.blit_array(surf, np.ascontiguousarray(pixels))
+    return _display_format(surf)
 
 def draw_gradient(surface, rect, color1, color2, vertical=True):
     x, y, w, h = rect
-    for i in range(h if vertical else w):
-        color = [
-            int(color1[j] + (float(i)/(h if vertical else w)) * (color2[j] - color1[j]))
-            for j in range(3)
-        ]
-        if vertical:
-            pygame.draw.line(surface, color, (x, y+i), (x+w, y+i))
-        else:
-            pygame.draw.line(surface, color, (x+i, y), (x+i, y+h))
+    surface.blit(gradient_surface((w, h), color1, color2, vertical), (x, y))
 
 def draw_shadow(surface, rect, shadow_color=(0,0,0,100), offset=(5,5), radius=20):
     x, y, w, h = rect
-    shadow_surf = pygame.Surface((w, h), pygame.SRCALPHA)
-    draw_rounded_rect(shadow_surf, (0,0,w,h), shadow_color, radius)
+    shadow_surf = rounded_rect_surface((w, h), shadow_color, radius)
     surface.blit(shadow_surf, (x+offset[0], y+offset[1]))
 
 def animate_value(start, end, duration, elapsed):
     if elapsed >= duration:
         return end
     t = elapsed / duration
-    return start + (end - start) * t 
\ No newline at end of file
+    return start + (end - start) * t
+
+class DirtyRegionTracker:
+    # Finds which tiles of a surface changed since the last call, so a redrawn static
+    # screen can be presented with display.update(rects) instead of a full flip.
+    def __init__(self, tile=64):
+        self.tile = tile
+        self.previous = None
+
+    def reset(self):
+        # Next diff reports the whole surface, e.g. after something else drew to the screen
+        self.previous = None
+
+    def diff(self, surface):
+        w, h = surface.get_size()
+        try:
+            pixels = pygame.surfarray.pixels2d(surface)
+        except (ValueError, pygame.error):
+            self.previous = None
+            return [pygame.Rect(0, 0, w, h)]
+        try:
+            if self.previous is None or self.previous.shape != pixels.shape:
+                self.previous = pixels.copy()
+                return [pygame.Rect(0, 0, w, h)]
+            changed = pixels != self.previous
+            np.copyto(self.previous, pixels)
+        finally:
+            del pixels  # releases the surface lock
+        xs = np.arange(0, w, self.tile)
+        ys = np.arange(0, h, self.tile)
+        tiles = np.logical_or.reduceat(np.logical_or.reduceat(changed, xs, axis=0), ys, axis=1)
+        rects = []
+        for ty in range(tiles.shape[1]):
+            # Merge runs of changed tiles along each tile row
+            row = tiles[:, ty]
+            tx = 0
+            while tx < len(row):
+                if row[tx]:
+                    start = tx
+                    while tx < len(row) and row[tx]:
+                        tx += 1
+                    x, y = start * self.tile, ty * self.tile
+                    rects.append(pygame.Rect(x, y, min(tx * self.tile, w) - x, min(self.tile, h - y)))
+                else:
+                    tx += 1
+        return rects
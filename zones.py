@@ -0,0 +1,119 @@
+import pygame
+from text_renderer import render_text
+from ui_utils import draw_rounded_rect
+
+# Drop zones are data: a type (matched against each food item's 'type'), a label and a
+# colour. ZoneLayout places them once for a screen size and is then the only thing that
+# draws them, hit-tests them and says where their effects go.
+DEFAULT_ZONES = [
+    {'type': 'veg', 'label': 'VEG', 'color': [0, 200, 0]},
+    {'type': 'non-veg', 'label': 'NON-VEG', 'color': [200, 0, 0]},
+]
+# Colours for catalog types that have no zone configured
+PALETTE = [(30, 120, 220), (230, 150, 20), (140, 60, 200), (0, 160, 160), (200, 60, 140),
+           (120, 120, 40), (90, 90, 90), (220, 90, 60)]
+ZONE_SIZE = 180
+MARGIN = 40
+GAP = 40
+MIN_GAP = 12
+MIN_ZONE_SIZE = 24
+RADIUS = 20
+
+class DropZone:
+    __slots__ = ('type', 'label', 'color', 'rect')
+
+    def __init__(self, type_, label, color, rect):
+        self.type = type_
+        self.label = label
+        self.color = tuple(color)
+        self.rect = rect
+
+def zone_specs(configured, catalog_types=()):
+    # Configured zones first, then one per catalog type nobody configured
+    specs = [dict(z) for z in (configured or DEFAULT_ZONES)]
+    known = {z['type'] for z in specs}
+    extra = 0
+    for type_ in catalog_types:
+        if type_ not in known:
+            specs.append({'type': type_, 'label': type_.upper(), 'color': PALETTE[extra % len(PALETTE)]})
+            known.add(type_)
+            extra += 1
+    return specs
+
+class ZoneLayout:
+    def __init__(self, specs, screen_size, zone_size=ZONE_SIZE):
+        self.screen_size = screen_size
+        self.zones = []
+        self.by_type = {}
+        self.cells = {}
+        self.place(specs, zone_size)
+
+    def place(self, specs, zone_size):
+        # Columns down the left edge, then the right edge, each centred vertically; the
+        # left column fills first, so two zones sit where the original veg/non-veg boxes did.
+        # Zones shrink once two full-size columns are not enough, and once they would get
+        # smaller than MIN_ZONE_SIZE more columns are added, alternately inside the left and
+        # right ones, rather than running the columns off the screen.
+        width, height = self.screen_size
+        n = len(specs)
+        size, gap = zone_size, GAP
+        per_column = max(1, (height - 2 * MARGIN + gap) // (size + gap))
+        if n > 2 * per_column:
+            gap = MIN_GAP
+            columns = 2
+            while True:
+                per_column = -(-n // columns)
+                size = (height - 2 * MARGIN - (per_column - 1) * gap) // per_column
+                if size >= MIN_ZONE_SIZE or per_column == 1:
+                    break
+                columns += 1
+            size = max(1, min(size, zone_size))
+        for i, spec in enumerate(specs):
+            column, row = divmod(i, per_column)
+            in_column = min(per_column, n - column * per_column)
+            top = (height - (in_column * size + (in_column - 1) * gap)) // 2
+            inset = (column // 2) * (size + gap)
+            x = MARGIN + inset if column % 2 == 0 else width - MARGIN - size - inset
+            rect = pygame.Rect(x, top + row * (size + gap), size, size)
+            zone = DropZone(spec['type'], spec.get('label', spec['type'].upper()), spec.get('color', PALETTE[i % len(PALETTE)]), rect)
+            self.zones.append(zone)
+            self.by_type.setdefault(zone.type, zone)
+        # Bucket grid: every cell lists the zones overlapping it, so a hit test looks at one
+        # cell and at most a couple of rects however many zones there are
+        self.cell = size + gap
+        for index, zone in enumerate(self.zones):
+            r = zone.rect
+            for cx in range(r.left // self.cell, (r.right - 1) // self.cell + 1):
+                for cy in range(r.top // self.cell, (r.bottom - 1) // self.cell + 1):
+                    self.cells.setdefault((cx, cy), []).append(index)
+        self.label_size = max(16, 48 * size // ZONE_SIZE)
+
+    def hit(self, pos):
+        if pos is None:
+            return None
+        x, y = pos
+        for index in self.cells.get((int(x) // self.cell, int(y) // self.cell), ()):
+            r = self.zones[index].rect
+            # Strictly inside, as the original veg/non-veg test was
+            if r.left < x < r.right and r.top < y < r.bottom:
+                return self.zones[index]
+        return None
+
+    def zone(self, type_):
+        return self.by_type.get(type_)
+
+    def color(self, type_, default=(128, 128, 128)):
+        zone = self.by_type.get(type_)
+        return zone.color if zone else default
+
+    def types(self):
+        return [zone.type for zone in self.zones]
+
+    def draw(self, screen):
+        for zone in self.zones:
+            draw_rounded_rect(screen, zone.rect, zone.color, RADIUS)
+            text = render_text(zone.label, self.label_size, (255, 255, 255), None)
+            if text.get_width() > zone.rect.width - 8:
+                text = render_text(zone.label, max(12, self.label_size * (zone.rect.width - 8) // text.get_width()),
+                                   (255, 255, 255), None)
+            screen.blit(text, text.get_rect(center=zone.rect.center))